@@ -6,7 +6,12 @@ Automatically detects and analyzes items from screenshots
 import cv2
 import numpy as np
 import pytesseract
+import os
 import re
+import bisect
+import functools
+import hashlib
+import tempfile
 import tkinter as tk
 from tkinter import filedialog
 from PIL import Image, ImageTk, ImageGrab
@@ -14,6 +19,21 @@ import json
 from typing import Dict, List, Tuple, Optional
 import threading
 import time
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import mss
+    MSS_AVAILABLE = True
+except ImportError:
+    MSS_AVAILABLE = False
+
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
 
 
 class POEItemOCR:
@@ -36,6 +56,28 @@ class POEItemOCR:
             'intelligence': r'(?:\+)?(\d+) to intelligence',
         }
         
+        # Fuse all modifier patterns into one regex so each line is handled by
+        # a single match call. Every alternative is a lookahead anchored at the
+        # line start, so the engine tries modifier types in dict order and
+        # lastgroup names the first type matching anywhere in the line, like
+        # the old per-pattern loop. _group_indices maps a modifier type to the
+        # numbers of the capture groups holding its values
+        self._combined_pattern = re.compile(
+            '|'.join(f'(?=.*?(?P<{mod_type}>{pattern}))' for mod_type, pattern in self.modifier_patterns.items()),
+            re.IGNORECASE
+        )
+        self._group_indices = {}
+        group_index = 1
+        for mod_type, pattern in self.modifier_patterns.items():
+            value_count = re.compile(pattern).groups
+            self._group_indices[mod_type] = tuple(range(group_index + 1, group_index + 1 + value_count))
+            group_index += value_count + 1
+        
+        # Matches each line from its first to its last non-whitespace char,
+        # i.e. what line.strip() gives for every non-blank line
+        self._line_pattern = re.compile(r'\S(?:[^\n]*\S)?')
+        self._number_pattern = re.compile(r'\d+')
+        
         # Item rarity colors (BGR format for OpenCV)
         self.rarity_colors = {
             'normal': [(200, 200, 200), (255, 255, 255)],    # White
@@ -44,15 +86,90 @@ class POEItemOCR:
             'unique': [(0, 100, 200), (50, 150, 255)],       # Orange/Brown
         }
         
+        # HSV bounds for each colored rarity, converted once instead of per
+        # screenshot. Normal is the fallback result, so it needs no mask.
+        colored_rarities = [rarity for rarity in self.rarity_colors if rarity != 'normal']
+        reference_colors = np.uint8([[color for rarity in colored_rarities
+                                      for color in self.rarity_colors[rarity]]])
+        reference_hsv = cv2.cvtColor(reference_colors, cv2.COLOR_BGR2HSV)[0]  # one call for all colors
+        self._rarity_hsv = [
+            (rarity, reference_hsv[2 * i], reference_hsv[2 * i + 1])
+            for i, rarity in enumerate(colored_rarities)
+        ]
+        
+        # HSV color range for PoE tooltip detection
+        # Brown/dark borders (adjust these values based on PoE's actual tooltip colors)
+        self._tooltip_border_lower = np.array([15, 50, 20], dtype=np.uint8)   # Brown-ish lower bound
+        self._tooltip_border_upper = np.array([25, 255, 80], dtype=np.uint8)  # Brown-ish upper bound
+        
         # Configure tesseract with multiple PSM modes for different scenarios
-        self.base_config = '-c tessedit_char_whitelist=0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ%+:- '
+        self.char_whitelist = '0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ%+:- '
+        # LSTM engine only (--oem 1) with English set explicitly; pairs best
+        # with the tessdata_fast eng.traineddata model
+        self.base_args = ('--oem', '1', '-l', 'eng',
+                          '-c', f'tessedit_char_whitelist={self.char_whitelist.strip()}')
+        self.base_config = ' '.join(self.base_args)
+        # Tried in this order; uniform_block usually wins for dense tooltips
+        self.psm_modes = {
+            'uniform_block': 6,   # Original - uniform text block
+            'single_line': 7,     # Single text line
+            'single_word': 8,     # Single word
+            'raw_line': 13,       # Raw line, bypass word detection
+        }
+        # Full pytesseract config strings, joined once here rather than
+        # formatted per call (tesserocr sets the whitelist once per API instead)
         self.psm_configs = {
-            'uniform_block': f'--psm 6 {self.base_config}',  # Original - uniform text block
-            'single_line': f'--psm 7 {self.base_config}',    # Single text line
-            'single_word': f'--psm 8 {self.base_config}',    # Single word
-            'raw_line': f'--psm 13 {self.base_config}',      # Raw line, bypass word detection
+            mode_name: ' '.join(('--psm', str(psm)) + self.base_args)
+            for mode_name, psm in self.psm_modes.items()
         }
         
+        # Static structuring element for the morphological close in preprocessing
+        self._morph_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
+        
+        # Second-difference kernel for noise estimation; it cancels flat areas
+        # and linear gradients, leaving mostly pixel noise
+        self._noise_kernel = np.array([[1, -2, 1], [-2, 4, -2], [1, -2, 1]], np.float32)
+        
+        # By default one preprocessing variant is chosen from image statistics;
+        # set True to run and score all four (useful for debugging)
+        self.exhaustive_preprocessing = False
+        
+        # Shared worker threads for the independent preprocessing variants
+        self._preprocess_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='ocr-preprocess')
+        
+        # Simplified tier estimation thresholds (value >= threshold => tier)
+        # In a full implementation, you'd have comprehensive tier data
+        self.tier_thresholds = {
+            'life': [(120, 'T1'), (100, 'T2'), (80, 'T3'), (60, 'T4'), (0, 'T5')],
+            'energy_shield': [(100, 'T1'), (80, 'T2'), (60, 'T3'), (40, 'T4'), (0, 'T5')],
+            'damage': [(50, 'T1'), (40, 'T2'), (30, 'T3'), (20, 'T4'), (0, 'T5')],
+        }
+        # Ascending (thresholds, tiers) pairs for bisect lookups
+        self._tier_tables = {
+            mod_type: ([threshold for threshold, _ in reversed(tiers)],
+                       [tier for _, tier in reversed(tiers)])
+            for mod_type, tiers in self.tier_thresholds.items()
+        }
+        
+        # The same modifier lines recur across items (small base pools), so
+        # line parsing is memoized per instance
+        self._parse_line = functools.lru_cache(maxsize=4096)(self._parse_line)
+        
+        # Small LRU of OCR results keyed by preprocessed-image hash
+        self._ocr_cache = OrderedDict()
+        self._ocr_cache_size = 64
+        self._ocr_cache_lock = threading.Lock()
+        
+        # Pool of long-lived tesserocr APIs, grown on demand up to one per
+        # CPU. Avoids pytesseract's subprocess + temp file per call and
+        # releases the GIL; each API loads its own traineddata, so a
+        # single-image caller only ever pays for one.
+        self._tess_workers = os.cpu_count() or 1
+        self._tess_pool = queue.Queue()
+        self._tess_created = 0
+        self._tess_pool_lock = threading.Lock()
+        self._use_tesserocr = TESSEROCR_AVAILABLE
+        
         # Common PoE modifier aliases and variations for fuzzy matching
         self.modifier_aliases = {
             'life': ['maximum life', 'max life', 'to life', 'life pool', '+life'],
@@ -68,26 +185,91 @@ class POEItemOCR:
             'dexterity': ['dexterity', 'dex', 'to dexterity', '+dex'],
             'intelligence': ['intelligence', 'int', 'to intelligence', '+int'],
         }
+        # Aliases flattened and pre-split once for the fuzzy matching loop
+        self._alias_words = [
+            (mod_type, alias, self._split_words(alias))
+            for mod_type, aliases in self.modifier_aliases.items()
+            for alias in aliases
+        ]
+        
+        # mss handles are not thread-safe, so each thread lazily gets its own
+        self._thread_local = threading.local()
         
-    def capture_screen_region(self, x: int, y: int, width: int, height: int) -> Image.Image:
-        """Capture a specific region of the screen"""
+    def _get_screen_grabber(self):
+        """Return this thread's persistent mss instance, or None if unavailable"""
+        if not MSS_AVAILABLE:
+            return None
+        grabber = getattr(self._thread_local, 'sct', None)
+        if grabber is None:
+            try:
+                grabber = mss.mss()
+            except Exception as e:
+                print(f"Failed to initialize MSS: {e}")
+                return None
+            self._thread_local.sct = grabber
+        return grabber
+        
+    def _to_bgr_array(self, image) -> np.ndarray:
+        """Convert a PIL image to a BGR ndarray once; ndarrays pass through"""
+        if isinstance(image, np.ndarray):
+            return image
+        img_array = np.asarray(image)
+        if img_array.ndim == 2:
+            return cv2.cvtColor(img_array, cv2.COLOR_GRAY2BGR)
+        if img_array.shape[2] == 4:
+            return cv2.cvtColor(img_array, cv2.COLOR_RGBA2BGR)
+        return cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
+        
+    def capture_screen_region(self, x: int, y: int, width: int, height: int) -> Optional[np.ndarray]:
+        """Capture a specific region of the screen as a BGR array"""
         try:
-            # Use PIL to capture screen region
+            grabber = self._get_screen_grabber()
+            if grabber:
+                # Reuse the capture handle and read the raw BGRA buffer directly
+                monitor = {'left': x, 'top': y, 'width': width, 'height': height}
+                screenshot = grabber.grab(monitor)
+                bgra = np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(screenshot.height, screenshot.width, 4)
+                return cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR)
+            
+            # Fallback to PIL
             screenshot = ImageGrab.grab(bbox=(x, y, x + width, y + height))
-            return screenshot
+            return cv2.cvtColor(np.asarray(screenshot), cv2.COLOR_RGB2BGR)
         except Exception as e:
             print(f"Error capturing screen: {e}")
             return None
     
-    def auto_detect_tooltip(self) -> Optional[Image.Image]:
+    def capture_full_screen(self) -> Optional[np.ndarray]:
+        """Capture the primary monitor as a BGR array"""
+        try:
+            grabber = self._get_screen_grabber()
+            if grabber:
+                screenshot = grabber.grab(grabber.monitors[1])
+                bgra = np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(screenshot.height, screenshot.width, 4)
+                return cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR)
+            
+            # Fallback to PIL
+            return cv2.cvtColor(np.asarray(ImageGrab.grab()), cv2.COLOR_RGB2BGR)
+        except Exception as e:
+            print(f"Error capturing screen: {e}")
+            return None
+    
+    def auto_detect_tooltip(self) -> Optional[np.ndarray]:
         """Automatically detect and capture PoE item tooltip from screen"""
         try:
             # Capture full screen
-            full_screen = ImageGrab.grab()
-            screen_array = np.array(full_screen)
+            full_screen = self.capture_full_screen()
+            if full_screen is None:
+                return None
+            
+            # Search for candidates on a 4x downscaled copy (16x fewer pixels);
+            # tooltips are large enough to survive it. Coordinates are scaled
+            # back up before filtering and cropping the full-resolution image.
+            scan_scale = 4
+            small = cv2.resize(full_screen, None, fx=1 / scan_scale, fy=1 / scan_scale,
+                               interpolation=cv2.INTER_AREA)
             
             # Convert to different color spaces for analysis
-            hsv = cv2.cvtColor(screen_array, cv2.COLOR_RGB2HSV)
+            hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
             
             # PoE tooltip characteristics:
             # - Brown/dark border (typical PoE item tooltip style)
@@ -95,13 +277,8 @@ class POEItemOCR:
             # - Text content inside
             # - Usually appears near cursor
             
-            # Define color ranges for PoE tooltip detection
-            # Brown/dark borders (adjust these values based on PoE's actual tooltip colors)
-            tooltip_border_lower = np.array([15, 50, 20])   # Brown-ish lower bound
-            tooltip_border_upper = np.array([25, 255, 80])  # Brown-ish upper bound
-            
             # Create mask for tooltip colors
-            tooltip_mask = cv2.inRange(hsv, tooltip_border_lower, tooltip_border_upper)
+            tooltip_mask = cv2.inRange(hsv, self._tooltip_border_lower, self._tooltip_border_upper)
             
             # Find contours that might be tooltips
             contours, _ = cv2.findContours(tooltip_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
@@ -110,8 +287,8 @@ class POEItemOCR:
             best_score = 0
             
             for contour in contours:
-                # Get bounding rectangle
-                x, y, w, h = cv2.boundingRect(contour)
+                # Get bounding rectangle in full-resolution coordinates
+                x, y, w, h = (v * scan_scale for v in cv2.boundingRect(contour))
                 
                 # Filter by size (tooltips are usually medium-sized rectangles)
                 if w < 200 or h < 100 or w > 800 or h > 600:
@@ -136,8 +313,7 @@ class POEItemOCR:
             # If we found a good candidate, extract it
             if best_tooltip_region and best_score > 0.3:
                 x, y, w, h = best_tooltip_region
-                tooltip_image = full_screen.crop((x, y, x + w, y + h))
-                return tooltip_image
+                return full_screen[y:y + h, x:x + w]
             
             return None
             
@@ -145,11 +321,14 @@ class POEItemOCR:
             print(f"Auto tooltip detection error: {e}")
             return None
     
-    def analyze_tooltip_content(self, tooltip_image: Image.Image) -> Dict:
+    def analyze_tooltip_content(self, tooltip_image) -> Dict:
         """Analyze the content of a detected tooltip for PoE-specific information"""
         try:
+            # Convert once; preprocessing and rarity detection share the array
+            img_bgr = self._to_bgr_array(tooltip_image)
+            
             # Preprocess the tooltip image
-            processed = self.preprocess_image(tooltip_image)
+            processed = self.preprocess_image(img_bgr)
             if processed is None:
                 return {'error': 'Failed to preprocess tooltip'}
             
@@ -162,7 +341,7 @@ class POEItemOCR:
             modifiers = self.parse_item_modifiers(text)
             
             # Detect item rarity
-            rarity = self.detect_item_rarity(tooltip_image)
+            rarity = self.detect_item_rarity(img_bgr)
             
             # Try to extract item name (usually first line)
             lines = text.split('\n')
@@ -180,12 +359,19 @@ class POEItemOCR:
         except Exception as e:
             return {'error': f'Tooltip analysis failed: {e}'}
             
-    def preprocess_image(self, image: Image.Image) -> np.ndarray:
+    def preprocess_image(self, img_bgr: np.ndarray) -> np.ndarray:
         """Preprocess image with adaptive methods for better OCR results"""
         try:
-            # Convert PIL to OpenCV format
-            img_array = np.array(image)
-            img_bgr = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
+            # Convert to grayscale once; every variant works on gray
+            if img_bgr.ndim == 2:
+                gray = img_bgr
+            else:
+                gray = cv2.cvtColor(self._crop_to_tooltip(img_bgr), cv2.COLOR_BGR2GRAY)
+            gray = self._normalize_text_scale(gray)
+            
+            if not self.exhaustive_preprocessing:
+                # Pick the one variant the image statistics call for
+                return self._select_preprocess_variant(gray)(gray)
             
             # Try multiple preprocessing approaches and select the best one
             preprocessing_variants = [
@@ -198,10 +384,16 @@ class POEItemOCR:
             best_image = None
             best_score = 0
             
-            for preprocess_func in preprocessing_variants:
+            # The variants are independent OpenCV calls that release the GIL,
+            # so run and score them concurrently
+            futures = [
+                self._preprocess_pool.submit(self._run_preprocess_variant, preprocess_func, gray)
+                for preprocess_func in preprocessing_variants
+            ]
+            
+            for future in futures:
                 try:
-                    processed = preprocess_func(img_bgr)
-                    score = self._evaluate_preprocessing_quality(processed)
+                    processed, score = future.result()
                     
                     if score > best_score:
                         best_score = score
@@ -213,7 +405,7 @@ class POEItemOCR:
             
             # Fallback to standard if all variants failed
             if best_image is None:
-                best_image = self._preprocess_standard(img_bgr)
+                best_image = self._preprocess_standard(gray)
             
             return best_image
             
@@ -221,34 +413,77 @@ class POEItemOCR:
             print(f"Error preprocessing image: {e}")
             return None
     
-    def _preprocess_standard(self, img_bgr: np.ndarray) -> np.ndarray:
-        """Standard preprocessing (original method)"""
-        gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
-        filtered = cv2.bilateralFilter(gray, 9, 75, 75)
-        _, thresh = cv2.threshold(filtered, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        kernel = np.ones((2, 2), np.uint8)
-        return cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
+    def _select_preprocess_variant(self, gray: np.ndarray):
+        """Choose a preprocessing variant from cheap image statistics"""
+        mean, std = cv2.meanStdDev(gray)
+        mean, std = mean[0][0], std[0][0]
+        
+        # Clean rendered tooltips (and JPEG-compressed ones) estimate at 0.0;
+        # Gaussian capture noise of sigma 15 estimates at 1.0-4.2
+        if self._noise_sigma(gray) > 2.0:  # Noisy image
+            return self._preprocess_denoised
+        if std < 30:  # Faded, low-contrast text
+            return self._preprocess_high_contrast
+        if mean < 100 or mean > 200:  # Very dark or very bright image
+            return self._preprocess_adaptive
+        return self._preprocess_standard
     
-    def _preprocess_high_contrast(self, img_bgr: np.ndarray) -> np.ndarray:
-        """High contrast preprocessing for faded text"""
-        gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
+    def _run_preprocess_variant(self, preprocess_func, gray: np.ndarray) -> Tuple[np.ndarray, float]:
+        """Apply one preprocessing variant and score the result"""
+        processed = preprocess_func(gray)
+        return processed, self._evaluate_preprocessing_quality(processed)
+    
+    def _normalize_text_scale(self, gray: np.ndarray) -> np.ndarray:
+        """Resize so tooltip text lands near the height Tesseract's LSTM expects"""
+        height = gray.shape[0]
+        if height > 800:
+            # High-resolution capture: shrink, OCR cost scales with pixel count
+            scale = 800 / height
+            return cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        if height < 300:
+            # Small capture: enlarge (at most 2x) so glyphs aren't too small
+            scale = min(2.0, 300 / height)
+            return cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+        return gray
+    
+    def _crop_to_tooltip(self, img_bgr: np.ndarray) -> np.ndarray:
+        """Crop large captures to the dark tooltip background, if one stands out"""
+        height, width = img_bgr.shape[:2]
+        if width <= 600:
+            return img_bgr
         
+        # PoE tooltips sit on a dark gray (#1e1e1e-ish) background
+        mask = cv2.inRange(img_bgr, (20, 20, 20), (45, 45, 45))
+        x, y, w, h = cv2.boundingRect(mask)
+        
+        # Only crop when the region is clearly smaller than the capture
+        if w > 100 and h > 100 and w * h < 0.5 * width * height:
+            return img_bgr[y:y + h, x:x + w]
+        return img_bgr
+    
+    def _preprocess_standard(self, gray: np.ndarray) -> np.ndarray:
+        """Standard preprocessing for sharp rendered UI text"""
+        # A separable 3x3 blur plus adaptive threshold replaces the old 9x9
+        # bilateral filter + Otsu pass at a fraction of the cost
+        blurred = cv2.GaussianBlur(gray, (3, 3), 0)
+        thresh = cv2.adaptiveThreshold(blurred, 255, cv2.ADAPTIVE_THRESH_MEAN_C,
+                                     cv2.THRESH_BINARY, 15, 8)
+        # thresh is our own temporary, so close it in place
+        return cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, self._morph_kernel, dst=thresh)
+    
+    def _preprocess_high_contrast(self, gray: np.ndarray) -> np.ndarray:
+        """High contrast preprocessing for faded text"""
         # Enhance contrast using CLAHE
         clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
         enhanced = clahe.apply(gray)
         
-        # Apply adaptive threshold
-        thresh = cv2.adaptiveThreshold(enhanced, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
+        # Apply adaptive threshold (a 1x1 morphological close used to follow,
+        # but that is an identity operation)
+        return cv2.adaptiveThreshold(enhanced, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
                                      cv2.THRESH_BINARY, 11, 2)
-        
-        # Clean up with morphological operations
-        kernel = np.ones((1, 1), np.uint8)
-        return cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
     
-    def _preprocess_adaptive(self, img_bgr: np.ndarray) -> np.ndarray:
+    def _preprocess_adaptive(self, gray: np.ndarray) -> np.ndarray:
         """Adaptive preprocessing that adjusts based on image characteristics"""
-        gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
-        
         # Analyze image brightness to choose appropriate preprocessing
         mean_brightness = np.mean(gray)
         
@@ -269,33 +504,52 @@ class POEItemOCR:
         
         return thresh
     
-    def _preprocess_denoised(self, img_bgr: np.ndarray) -> np.ndarray:
+    def _preprocess_denoised(self, gray: np.ndarray) -> np.ndarray:
         """Denoising-focused preprocessing for noisy images"""
-        gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
-        
-        # Apply Non-local Means Denoising
-        denoised = cv2.fastNlMeansDenoising(gray, None, 10, 7, 21)
+        # Edge-preserving bilateral filter; rendered tooltip text only carries
+        # aliasing noise, so Non-local Means (~20x the cost) buys nothing
+        # (bilateralFilter cannot run in place; the steps after it reuse its buffer)
+        denoised = cv2.bilateralFilter(gray, 5, 40, 40)
         
         # Apply Gaussian blur to further smooth
-        blurred = cv2.GaussianBlur(denoised, (3, 3), 0)
+        cv2.GaussianBlur(denoised, (3, 3), 0, dst=denoised)
         
         # Apply threshold
-        _, thresh = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        cv2.threshold(denoised, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=denoised)
         
-        return thresh
+        return denoised
+    
+    def _noise_sigma(self, gray: np.ndarray) -> float:
+        """Robust estimate of the pixel noise standard deviation
+        
+        Takes the median absolute response of the second-difference kernel
+        rather than its variance, so the strong responses along text edges
+        (a minority of pixels) don't register as noise.
+        """
+        # 4x scale keeps quarter-step resolution in the uint8 histogram
+        response = cv2.convertScaleAbs(cv2.filter2D(gray, cv2.CV_16S, self._noise_kernel), alpha=4)
+        hist = cv2.calcHist([response], [0], None, [256], [0, 256]).ravel()
+        median = int(np.searchsorted(np.cumsum(hist), response.size / 2))
+        # MAD -> sigma, with the kernel's gain of 6 on white noise
+        return median / (4 * 0.6745 * 6)
+    
+    @staticmethod
+    def _laplacian_variance(gray: np.ndarray) -> float:
+        """Variance of the Laplacian, reduced inside OpenCV"""
+        return cv2.meanStdDev(cv2.Laplacian(gray, cv2.CV_64F))[1][0][0] ** 2
     
     def _evaluate_preprocessing_quality(self, processed_image: np.ndarray) -> float:
         """Evaluate the quality of preprocessing for OCR"""
         try:
             # Calculate text-like regions using edge detection
             edges = cv2.Canny(processed_image, 50, 150)
-            edge_density = np.sum(edges > 0) / edges.size
+            edge_density = cv2.countNonZero(edges) / edges.size
             
             # Calculate contrast using standard deviation
-            contrast = np.std(processed_image) / 255.0
+            contrast = cv2.meanStdDev(processed_image)[1][0][0] / 255.0
             
             # Calculate noise level (inverse of smoothness)
-            laplacian_var = cv2.Laplacian(processed_image, cv2.CV_64F).var()
+            laplacian_var = self._laplacian_variance(processed_image)
             noise_score = min(1.0, laplacian_var / 1000.0)  # Normalize
             
             # Combine metrics (higher is better for edge_density and contrast, lower for noise)
@@ -306,34 +560,155 @@ class POEItemOCR:
         except Exception:
             return 0.0
             
+    def _acquire_tess_api(self):
+        """Take an idle tesserocr API, creating one if the pool isn't full yet
+        
+        Returns None when tesserocr is unavailable or failed to initialize.
+        """
+        if not self._use_tesserocr:
+            return None
+        try:
+            return self._tess_pool.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._tess_pool_lock:
+            if not self._use_tesserocr:
+                return None
+            if self._tess_created < self._tess_workers:
+                if self._tess_created == 0:
+                    # Tesseract's OpenMP threads fight with the pool's own
+                    # threads; limit them only once tesserocr is really used
+                    os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+                api = None
+                try:
+                    api = tesserocr.PyTessBaseAPI(lang='eng', psm=tesserocr.PSM.SINGLE_BLOCK,
+                                                  oem=tesserocr.OEM.LSTM_ONLY)
+                    api.SetVariable('tessedit_char_whitelist', self.char_whitelist)
+                except Exception as e:
+                    print(f"Failed to initialize tesserocr, falling back to pytesseract: {e}")
+                    self._use_tesserocr = False
+                    if api is not None:
+                        api.End()
+                    # Free the idle APIs now; busy ones are freed on release
+                    while True:
+                        try:
+                            self._tess_pool.get_nowait().End()
+                        except queue.Empty:
+                            break
+                    return None
+                self._tess_created += 1
+                return api
+        
+        # Pool is at capacity: wait for another thread to release one
+        return self._tess_pool.get()
+    
+    def _release_tess_api(self, api):
+        """Return an API taken with _acquire_tess_api to the pool"""
+        with self._tess_pool_lock:
+            if self._use_tesserocr:
+                self._tess_pool.put(api)
+                return
+        api.End()
+        
+    def _ocr_with_mode(self, ocr_input, mode_name: str, api=None) -> Tuple[str, float]:
+        """Run OCR for one PSM mode, returning (text, confidence)
+        
+        ocr_input is a PIL image for tesserocr, or an image file path (the
+        array itself if encoding failed) for pytesseract (see
+        extract_text_from_image).
+        """
+        if api is not None:
+            api.SetPageSegMode(self.psm_modes[mode_name])
+            api.SetImage(ocr_input)
+            return api.GetUTF8Text(), float(api.MeanTextConf())
+        
+        # One Tesseract run per mode: image_to_data carries both the words and
+        # their confidences, so a separate image_to_string call is not needed
+        config = self.psm_configs[mode_name]
+        data = pytesseract.image_to_data(ocr_input, config=config, output_type=pytesseract.Output.DICT)
+        return self._text_from_ocr_data(data), self._calculate_confidence(data)
+        
+    def _text_from_ocr_data(self, data: dict) -> str:
+        """Rebuild the plain text from image_to_data output, one line per OCR line"""
+        lines = []
+        current_key = None
+        for i, word in enumerate(data['text']):
+            if not word or not word.strip():
+                continue
+            key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            if key != current_key:
+                lines.append([])
+                current_key = key
+            lines[-1].append(word)
+        return '\n'.join(' '.join(words) for words in lines)
+        
     def extract_text_from_image(self, image: np.ndarray) -> str:
         """Extract text using intelligent multi-PSM OCR approach"""
         try:
+            # Re-inspecting the same tooltip yields the same preprocessed image;
+            # skip Tesseract entirely when we have already read it
+            cache_key = self._image_fingerprint(image)
+            with self._ocr_cache_lock:
+                if cache_key in self._ocr_cache:
+                    self._ocr_cache.move_to_end(cache_key)
+                    return self._ocr_cache[cache_key]
+            
             # Try multiple PSM modes and select the best result
             ocr_results = []
             
-            for mode_name, config in self.psm_configs.items():
-                try:
-                    # Extract text with this configuration
-                    text = pytesseract.image_to_string(image, config=config)
-                    
-                    # Get confidence data
-                    data = pytesseract.image_to_data(image, config=config, output_type=pytesseract.Output.DICT)
-                    confidence = self._calculate_confidence(data)
-                    
-                    # Score the result based on confidence and content quality
-                    score = self._score_ocr_result(text, confidence)
-                    
-                    ocr_results.append({
-                        'mode': mode_name,
-                        'text': text.strip(),
-                        'confidence': confidence,
-                        'score': score
-                    })
-                    
-                except Exception as e:
-                    print(f"OCR failed for mode {mode_name}: {e}")
-                    continue
+            api = self._acquire_tess_api()
+            temp_path = None
+            try:
+                # Convert the image once for all PSM modes. pytesseract would
+                # otherwise re-encode it to a temp PNG on every call, but it
+                # passes file paths straight through to tesseract.
+                if api is not None:
+                    ocr_input = Image.fromarray(image)
+                else:
+                    # Encode in memory and write through the mkstemp fd:
+                    # cv2.imwrite can't open non-ASCII paths on Windows, and
+                    # %TEMP% lives under the user profile
+                    ok, buf = cv2.imencode('.png', image, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+                    if ok:
+                        fd, temp_path = tempfile.mkstemp(suffix='.png')
+                        try:
+                            os.write(fd, buf.tobytes())
+                        finally:
+                            os.close(fd)
+                        ocr_input = temp_path
+                    else:
+                        # pytesseract encodes the array itself
+                        ocr_input = image
+                
+                for mode_name in self.psm_modes:
+                    try:
+                        # Extract text and confidence with this configuration
+                        text, confidence = self._ocr_with_mode(ocr_input, mode_name, api)
+                        
+                        # Score the result based on confidence and content quality
+                        score = self._score_ocr_result(text, confidence)
+                        
+                        ocr_results.append({
+                            'mode': mode_name,
+                            'text': text.strip(),
+                            'confidence': confidence,
+                            'score': score
+                        })
+                        
+                        # A confident, PoE-looking read can't be meaningfully
+                        # beaten by the remaining modes
+                        if score > 0.75 and confidence > 80:
+                            break
+                        
+                    except Exception as e:
+                        print(f"OCR failed for mode {mode_name}: {e}")
+                        continue
+            finally:
+                if api is not None:
+                    self._release_tess_api(api)
+                if temp_path:
+                    os.remove(temp_path)
             
             if not ocr_results:
                 return ""
@@ -344,12 +719,24 @@ class POEItemOCR:
             # Optional: Log the decision for debugging
             print(f"Selected OCR mode: {best_result['mode']} (score: {best_result['score']:.2f})")
             
+            with self._ocr_cache_lock:
+                self._ocr_cache[cache_key] = best_result['text']
+                if len(self._ocr_cache) > self._ocr_cache_size:
+                    self._ocr_cache.popitem(last=False)
+            
             return best_result['text']
             
         except Exception as e:
             print(f"OCR extraction error: {e}")
             return ""
     
+    @staticmethod
+    def _image_fingerprint(image: np.ndarray) -> bytes:
+        """Exact content hash of an image, including its shape"""
+        digest = hashlib.blake2b(str(image.shape).encode(), digest_size=16)
+        digest.update(np.ascontiguousarray(image).data)
+        return digest.digest()
+    
     def _calculate_confidence(self, data: dict) -> float:
         """Calculate average confidence from OCR data"""
         confidences = [conf for conf in data['conf'] if conf > 0]
@@ -377,31 +764,27 @@ class POEItemOCR:
             length_penalty = 0.1
         
         # Bonus for having numbers (PoE modifiers often have numeric values)
-        number_bonus = 0.1 if re.search(r'\d+', text) else 0.0
+        number_bonus = 0.1 if self._number_pattern.search(text) else 0.0
         
         final_score = base_score + keyword_bonus + number_bonus - length_penalty
         return max(0.0, min(1.0, final_score))  # Clamp to 0-1
             
-    def detect_item_rarity(self, image: Image.Image) -> str:
+    def detect_item_rarity(self, img_bgr: np.ndarray) -> str:
         """Detect item rarity based on text color"""
         try:
-            img_array = np.array(image)
-            img_hsv = cv2.cvtColor(img_array, cv2.COLOR_RGB2HSV)
-            
-            # Check for different rarity colors
-            for rarity, (color_min, color_max) in self.rarity_colors.items():
-                # Convert to HSV for better color detection
-                hsv_min = cv2.cvtColor(np.uint8([[color_min]]), cv2.COLOR_BGR2HSV)[0][0]
-                hsv_max = cv2.cvtColor(np.uint8([[color_max]]), cv2.COLOR_BGR2HSV)[0][0]
-                
-                # Create mask for color range
-                mask = cv2.inRange(img_hsv, hsv_min, hsv_max)
-                
-                # If enough pixels match, this is likely the rarity
-                if np.sum(mask) > 1000:  # Threshold for color detection
-                    return rarity
+            img_hsv = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2HSV)
+            
+            # Count matching pixels for every rarity color, then take the
+            # strongest match so the result doesn't depend on check order
+            best_rarity = 'normal'  # Default to normal
+            best_count = 1000 // 255  # Threshold for color detection (was np.sum(mask) > 1000)
+            
+            for rarity, hsv_min, hsv_max in self._rarity_hsv:
+                count = cv2.countNonZero(cv2.inRange(img_hsv, hsv_min, hsv_max))
+                if count > best_count:
+                    best_rarity, best_count = rarity, count
                     
-            return 'normal'  # Default to normal
+            return best_rarity
             
         except Exception as e:
             print(f"Error detecting rarity: {e}")
@@ -410,120 +793,143 @@ class POEItemOCR:
     def parse_item_modifiers(self, text: str) -> List[Dict]:
         """Parse modifiers from extracted text with fuzzy matching"""
         modifiers = []
-        lines = text.split('\n')
         
-        for line in lines:
-            line_clean = line.strip().lower()
-            if not line_clean:
-                continue
-                
-            # First try exact pattern matching
-            found = False
-            for mod_type, pattern in self.modifier_patterns.items():
-                matches = re.findall(pattern, line_clean, re.IGNORECASE)
-                if matches:
-                    modifiers.append({
-                        'type': mod_type,
-                        'raw_text': line.strip(),
-                        'values': matches[0] if isinstance(matches[0], tuple) else [matches[0]],
-                        'tier': self.estimate_modifier_tier(mod_type, matches[0]),
-                        'confidence': 'high'
-                    })
-                    found = True
-                    break
-            
-            # If no exact match, try fuzzy matching
-            if not found:
-                fuzzy_match = self._fuzzy_match_modifier(line_clean)
-                if fuzzy_match:
-                    modifiers.append({
-                        'type': fuzzy_match['type'],
-                        'raw_text': line.strip(),
-                        'values': fuzzy_match['values'],
-                        'tier': 'unknown',
-                        'confidence': 'medium',
-                        'fuzzy_score': fuzzy_match['score']
-                    })
+        # One C-level scan yields every stripped, non-empty line
+        for line_clean in self._line_pattern.findall(text):
+            parsed = self._parse_line(line_clean)
+            if parsed:
+                # Cached results are shared, so hand out a fresh dict and values list
+                modifiers.append(dict(parsed, raw_text=line_clean, values=list(parsed['values'])))
                     
         return modifiers
     
+    def _parse_line(self, line_clean: str) -> Optional[Dict]:
+        """Parse a single stripped line; memoized per instance in __init__"""
+        # First try exact pattern matching
+        match = self._combined_pattern.match(line_clean)
+        if match:
+            mod_type = match.lastgroup
+            # Read only this alternative's groups rather than all of m.groups()
+            first_match = match.group(*self._group_indices[mod_type])
+            # The line is matched as-is under IGNORECASE; lowercase the values
+            # so captured words (e.g. element names) read as before
+            if isinstance(first_match, tuple):
+                values = tuple(value.lower() for value in first_match)
+                first_match = values
+            else:
+                first_match = first_match.lower()
+                values = (first_match,)
+            return {
+                'type': mod_type,
+                'values': values,
+                'tier': self.estimate_modifier_tier(mod_type, first_match),
+                'confidence': 'high'
+            }
+        
+        # If no exact match, try fuzzy matching
+        fuzzy_match = self._fuzzy_match_modifier(line_clean)
+        if fuzzy_match:
+            return {
+                'type': fuzzy_match['type'],
+                'values': tuple(fuzzy_match['values']),
+                'tier': 'unknown',
+                'confidence': 'medium',
+                'fuzzy_score': fuzzy_match['score']
+            }
+        
+        return None
+    
     def _fuzzy_match_modifier(self, text: str) -> Optional[Dict]:
         """Use fuzzy matching to identify modifiers from misread text"""
         best_match = None
         best_score = 0.6  # Minimum similarity threshold
         
+        # Split the line once; alias word sets are prepared in __init__
+        words = self._split_words(text)
+        if not words[0]:
+            return None
+        
         # Extract numbers from the text first
-        numbers = re.findall(r'\d+', text)
+        numbers = self._number_pattern.findall(text)
         
-        for mod_type, aliases in self.modifier_aliases.items():
-            for alias in aliases:
-                similarity = self._calculate_similarity(text, alias)
-                
-                if similarity > best_score:
-                    best_score = similarity
-                    best_match = {
-                        'type': mod_type,
-                        'values': numbers if numbers else ['?'],
-                        'score': similarity,
-                        'matched_alias': alias
-                    }
+        for mod_type, alias, alias_words in self._alias_words:
+            similarity = self._word_similarity(words, alias_words)
+            
+            if similarity > best_score:
+                best_score = similarity
+                best_match = {
+                    'type': mod_type,
+                    'values': numbers if numbers else ['?'],
+                    'score': similarity,
+                    'matched_alias': alias
+                }
         
         return best_match
     
-    def _calculate_similarity(self, text1: str, text2: str) -> float:
-        """Calculate similarity between two strings using simple Levenshtein-like approach"""
-        # Simple implementation of edit distance similarity
-        if not text1 or not text2:
-            return 0.0
-        
-        # Convert to sets of words for fuzzy word matching
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
+    @staticmethod
+    def _split_words(text: str) -> Tuple[frozenset, Tuple[str, ...], int]:
+        """Return the word set of text, the words long enough for partial
+        matching, and a 64-bit bitmap of the character bigrams in its words"""
+        words = frozenset(text.lower().split())
+        fingerprint = 0
+        for word in words:
+            # Pad so even one-character words contribute bigrams
+            padded = f' {word} '
+            for a, b in zip(padded, padded[1:]):
+                fingerprint |= 1 << ((ord(a) * 31 + ord(b)) & 63)
+        return words, tuple(word for word in words if len(word) >= 3), fingerprint
+    
+    @staticmethod
+    def _word_similarity(words1: Tuple[frozenset, Tuple[str, ...], int],
+                         words2: Tuple[frozenset, Tuple[str, ...], int]) -> float:
+        """Similarity of two pre-split word sets (see _calculate_similarity)"""
+        set1, long1, fingerprint1 = words1
+        set2, long2, fingerprint2 = words2
         
-        if not words1 or not words2:
+        # Shared or overlapping words always share a bigram, so disjoint
+        # bitmaps mean a score of zero without touching the sets
+        if not set1 or not set2 or not fingerprint1 & fingerprint2:
             return 0.0
         
         # Calculate Jaccard similarity (intersection over union)
-        intersection = len(words1.intersection(words2))
-        union = len(words1.union(words2))
-        
-        jaccard_sim = intersection / union if union > 0 else 0.0
+        intersection = len(set1 & set2)
+        jaccard_sim = intersection / (len(set1) + len(set2) - intersection)
         
         # Also check for partial word matches
-        partial_matches = 0
-        for w1 in words1:
-            for w2 in words2:
-                if len(w1) >= 3 and len(w2) >= 3:
-                    if w1 in w2 or w2 in w1:
-                        partial_matches += 0.5
-        
-        partial_sim = min(1.0, partial_matches / max(len(words1), len(words2)))
+        partial_matches = 0.5 * sum(1 for w1 in long1 for w2 in long2 if w1 in w2 or w2 in w1)
+        partial_sim = min(1.0, partial_matches / max(len(set1), len(set2)))
         
         # Combine both similarities
         return (jaccard_sim * 0.7) + (partial_sim * 0.3)
+    
+    def _calculate_similarity(self, text1: str, text2: str) -> float:
+        """Calculate similarity between two strings using simple Levenshtein-like approach"""
+        if not text1 or not text2:
+            return 0.0
+        return self._word_similarity(self._split_words(text1), self._split_words(text2))
         
     def estimate_modifier_tier(self, mod_type: str, values) -> str:
         """Estimate modifier tier based on values"""
-        # This is a simplified tier estimation
-        # In a full implementation, you'd have comprehensive tier data
-        tier_thresholds = {
-            'life': [(120, 'T1'), (100, 'T2'), (80, 'T3'), (60, 'T4'), (0, 'T5')],
-            'energy_shield': [(100, 'T1'), (80, 'T2'), (60, 'T3'), (40, 'T4'), (0, 'T5')],
-            'damage': [(50, 'T1'), (40, 'T2'), (30, 'T3'), (20, 'T4'), (0, 'T5')],
-        }
-        
-        if mod_type not in tier_thresholds:
+        tier_table = self._tier_tables.get(mod_type)
+        if tier_table is None:
             return 'Unknown'
             
-        try:
-            value = int(values) if not isinstance(values, tuple) else int(values[0])
-            for threshold, tier in tier_thresholds[mod_type]:
-                if value >= threshold:
-                    return tier
-        except (ValueError, IndexError):
-            pass
+        # Check the value up front instead of relying on int() raising, which
+        # is costly when noisy OCR text makes the failure path common
+        if isinstance(values, tuple):
+            if not values:
+                return 'T5'
+            values = values[0]
+        if isinstance(values, str):
+            if not values.isdecimal():
+                return 'T5'
+            values = int(values)
+        elif not isinstance(values, int):
+            return 'T5'
             
-        return 'T5'
+        thresholds, tiers = tier_table
+        index = bisect.bisect_right(thresholds, values) - 1
+        return tiers[index] if index >= 0 else 'T5'
         
     def analyze_item_screenshot(self, image_path: Optional[str] = None, 
                                screen_region: Optional[Tuple[int, int, int, int]] = None) -> Dict:
@@ -531,7 +937,9 @@ class POEItemOCR:
         try:
             # Get image
             if image_path:
-                image = Image.open(image_path)
+                # Decode straight to a BGR array; np.fromfile + imdecode
+                # (rather than cv2.imread) also copes with non-ASCII paths on Windows
+                image = cv2.imdecode(np.fromfile(image_path, dtype=np.uint8), cv2.IMREAD_COLOR)
             elif screen_region:
                 x, y, width, height = screen_region
                 image = self.capture_screen_region(x, y, width, height)
@@ -540,9 +948,12 @@ class POEItemOCR:
                 
             if image is None:
                 return {'error': 'Failed to load image'}
+            
+            # Convert once; preprocessing and rarity detection share the array
+            img_bgr = self._to_bgr_array(image)
                 
             # Preprocess image
-            processed_img = self.preprocess_image(image)
+            processed_img = self.preprocess_image(img_bgr)
             if processed_img is None:
                 return {'error': 'Failed to preprocess image'}
                 
@@ -552,7 +963,7 @@ class POEItemOCR:
                 return {'error': 'No text extracted from image'}
                 
             # Detect item rarity
-            rarity = self.detect_item_rarity(image)
+            rarity = self.detect_item_rarity(img_bgr)
             
             # Parse modifiers
             modifiers = self.parse_item_modifiers(text)
@@ -576,6 +987,14 @@ class POEItemOCR:
         except Exception as e:
             return {'error': f'Analysis failed: {e}'}
             
+    def analyze_batch(self, image_paths: List[str]) -> List[Dict]:
+        """Analyze several screenshots concurrently, preserving input order"""
+        with ThreadPoolExecutor(max_workers=self._tess_workers) as executor:
+            return list(executor.map(
+                lambda path: self.analyze_item_screenshot(image_path=path),
+                image_paths
+            ))
+            
     def create_capture_overlay(self, callback_func) -> tk.Toplevel:
         """Create overlay for selecting screen region to capture"""
         overlay = tk.Toplevel()
@@ -585,33 +1004,39 @@ class POEItemOCR:
         overlay.configure(bg='red')
         overlay.attributes('-transparentcolor', 'red')
         
-        # Variables for selection
-        self.selection_start = None
-        self.selection_end = None
-        self.selection_rect = None
+        # Selection state lives in the closure so the shared analyzer stays
+        # reentrant and the motion handler avoids attribute lookups
+        selection = {'start': None, 'end': None, 'last_redraw_ns': 0}
         
         canvas = tk.Canvas(overlay, highlightthickness=0)
         canvas.pack(fill='both', expand=True)
         
         def start_selection(event):
-            self.selection_start = (event.x_root, event.y_root)
+            selection['start'] = (event.x_root, event.y_root)
             
         def update_selection(event):
-            if self.selection_start:
-                self.selection_end = (event.x_root, event.y_root)
+            start = selection['start']
+            if start:
+                selection['end'] = (event.x_root, event.y_root)
+                
+                # Motion fires per pixel; redraw at most ~60 times per second
+                now_ns = time.perf_counter_ns()
+                if now_ns - selection['last_redraw_ns'] < 16_000_000:
+                    return
+                selection['last_redraw_ns'] = now_ns
+                
                 # Clear previous rectangle
                 canvas.delete('selection')
                 # Draw new rectangle
                 canvas.create_rectangle(
-                    self.selection_start[0], self.selection_start[1],
-                    self.selection_end[0], self.selection_end[1],
+                    start[0], start[1], event.x_root, event.y_root,
                     outline='yellow', width=2, tags='selection'
                 )
                 
         def finish_selection(event):
-            if self.selection_start and self.selection_end:
-                x1, y1 = self.selection_start
-                x2, y2 = self.selection_end
+            if selection['start'] and selection['end']:
+                x1, y1 = selection['start']
+                x2, y2 = selection['end']
                 
                 # Ensure x1,y1 is top-left
                 x = min(x1, x2)
@@ -651,12 +1076,23 @@ class POEItemOCR:
             return None
 
 
+@functools.lru_cache(maxsize=256)
+def _display_label(name: str) -> str:
+    """Turn an identifier such as 'fire_resistance' into 'Fire Resistance'"""
+    return name.replace('_', ' ').title()
+
+
 class ItemDetectionGUI:
     """GUI interface for item detection and analysis"""
     
-    def __init__(self, parent_app):
+    # Fixed sections of the results report
+    RESULTS_HEADER = "ITEM ANALYSIS RESULTS\n" + "=" * 40 + "\n\n"
+    MODIFIERS_RULE = "-" * 30 + "\n"
+    RAW_TEXT_HEADER = "RAW EXTRACTED TEXT:\n" + "-" * 20 + "\n"
+    
+    def __init__(self, parent_app, ocr_analyzer: Optional[POEItemOCR] = None):
         self.parent_app = parent_app
-        self.ocr_analyzer = POEItemOCR()
+        self.ocr_analyzer = ocr_analyzer or get_ocr()
         self.detection_window = None
         
     def open_detection_window(self):
@@ -733,75 +1169,82 @@ class ItemDetectionGUI:
             
     def display_results(self, result: Dict):
         """Display analysis results"""
-        self.results_text.delete(1.0, tk.END)
-        
         if 'error' in result:
-            self.results_text.insert(tk.END, f"Error: {result['error']}")
+            self.results_text.replace("1.0", tk.END, f"Error: {result['error']}")
             return
             
-        # Display item information
-        output = f"ITEM ANALYSIS RESULTS\n"
-        output += "=" * 40 + "\n\n"
+        # Collect the output in a list and write it to the widget in one go
+        parts = [self.RESULTS_HEADER]
+        append = parts.append
         
         if 'item_name' in result:
-            output += f"Item Name: {result['item_name']}\n"
+            append(f"Item Name: {result['item_name']}\n")
         if 'item_base' in result:
-            output += f"Item Base: {result['item_base']}\n"
+            append(f"Item Base: {result['item_base']}\n")
         if 'rarity' in result:
-            output += f"Rarity: {result['rarity'].title()}\n\n"
+            append(f"Rarity: {_display_label(result['rarity'])}\n\n")
             
         # Display modifiers
         if 'modifiers' in result and result['modifiers']:
-            output += f"DETECTED MODIFIERS ({len(result['modifiers'])}):\n"
-            output += "-" * 30 + "\n"
+            append(f"DETECTED MODIFIERS ({len(result['modifiers'])}):\n")
+            append(self.MODIFIERS_RULE)
             
             for i, mod in enumerate(result['modifiers'], 1):
-                output += f"{i}. {mod['type'].replace('_', ' ').title()}\n"
-                output += f"   Text: {mod['raw_text']}\n"
-                output += f"   Tier: {mod['tier']}\n"
+                append(f"{i}. {_display_label(mod['type'])}\n"
+                       f"   Text: {mod['raw_text']}\n"
+                       f"   Tier: {mod['tier']}\n")
                 if 'values' in mod:
-                    output += f"   Values: {mod['values']}\n"
-                output += "\n"
+                    append(f"   Values: {mod['values']}\n")
+                append("\n")
         else:
-            output += "No modifiers detected.\n\n"
+            append("No modifiers detected.\n\n")
             
         # Raw text section
         if 'raw_text' in result:
-            output += "RAW EXTRACTED TEXT:\n"
-            output += "-" * 20 + "\n"
-            output += result['raw_text']
-            output += "\n\n"
+            append(self.RAW_TEXT_HEADER)
+            append(result['raw_text'])
+            append("\n\n")
             
         # Auto-populate main application
         if result.get('success') and 'modifiers' in result:
             self.auto_populate_main_app(result)
-            output += "✅ Main application auto-populated with detected data!\n"
+            append("✅ Main application auto-populated with detected data!\n")
         
-        self.results_text.insert(tk.END, output)
+        self.results_text.replace("1.0", tk.END, "".join(parts))
         
     def auto_populate_main_app(self, result: Dict):
         """Auto-populate main application with detected data"""
         try:
-            # Clear existing entries
-            self.parent_app.base_entry.delete(0, tk.END)
-            self.parent_app.target_mods_text.delete(1.0, tk.END)
-            
-            # Set base item
-            if 'item_base' in result:
-                self.parent_app.base_entry.insert(0, result['item_base'])
+            # Set base item, leaving the entry alone when it already matches
+            base_entry = self.parent_app.base_entry
+            item_base = result.get('item_base', '')
+            if base_entry.get() != item_base:
+                base_entry.delete(0, tk.END)
+                if item_base:
+                    base_entry.insert(0, item_base)
                 
-            # Set target modifiers
+            # Set target modifiers with a single widget update
+            mod_text = ""
             if 'modifiers' in result:
-                mod_text = ""
-                for mod in result['modifiers']:
-                    mod_name = mod['type'].replace('_', ' ').title()
-                    mod_text += f"{mod_name}\n"
-                    
-                self.parent_app.target_mods_text.insert(1.0, mod_text.strip())
+                mod_text = "\n".join(_display_label(mod['type'])
+                                     for mod in result['modifiers'])
+            self.parent_app.target_mods_text.replace("1.0", tk.END, mod_text)
                 
         except Exception as e:
             print(f"Error auto-populating: {e}")
 
 
-# Global OCR analyzer instance
-poe_ocr = POEItemOCR()
\ No newline at end of file
+# Global OCR analyzer instance, created on first use so importing this
+# module stays cheap
+_poe_ocr = None
+_poe_ocr_lock = threading.Lock()
+
+
+def get_ocr() -> POEItemOCR:
+    """Return the shared OCR analyzer instance"""
+    global _poe_ocr
+    
+    with _poe_ocr_lock:
+        if _poe_ocr is None:
+            _poe_ocr = POEItemOCR()
+    return _poe_ocr
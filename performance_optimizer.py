@@ -4,13 +4,20 @@ Optimizes resource usage, memory management, and UI responsiveness
 """
 
 import gc
+import logging
+import multiprocessing
+import os
+import queue
+from bisect import bisect_right
 import threading
 import time
-from typing import Dict, Any, Callable
+from typing import Dict, Any, Callable, Optional
 import weakref
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
 import tkinter as tk
+import numpy as np
 
 # Try to import psutil, fallback to None if not available
 try:
@@ -20,6 +27,34 @@ except ImportError:
     psutil = None
     PSUTIL_AVAILABLE = False
 
+logger = logging.getLogger(__name__)
+
+# Errors that just mean a metrics sample couldn't be taken this tick
+SAMPLE_ERRORS = (psutil.Error, AttributeError) if PSUTIL_AVAILABLE else (AttributeError,)
+
+# Currencies kept when trimming market data under memory pressure
+ESSENTIAL_CURRENCIES = frozenset({'Chaos Orb', 'Divine Orb', 'Exalted Orb'})
+
+
+def _monitor_main(parent_pid: int, metrics_queue, interval: float):
+    """Sample a process's resource usage from a separate process
+    
+    Posts (cpu_usage, memory_percent, memory_mb, thread_count) tuples to
+    metrics_queue every interval seconds until the parent goes away.
+    """
+    try:
+        process = psutil.Process(parent_pid)
+        process.cpu_percent(interval=None)
+        while process.is_running():
+            time.sleep(interval)
+            with process.oneshot():
+                metrics_queue.put((process.cpu_percent(interval=None),
+                                   process.memory_percent(),
+                                   process.memory_info().rss / 1024 / 1024,
+                                   process.num_threads()))
+    except (psutil.Error, KeyboardInterrupt):
+        pass
+
 
 @dataclass
 class PerformanceMetrics:
@@ -33,14 +68,86 @@ class PerformanceMetrics:
     timestamp: datetime
 
 
+class MetricRing:
+    """Fixed-size ring buffer of float samples backed by a NumPy array
+    
+    Each row holds one metric, so statistics for every metric can be
+    computed with a single reduction over axis 1.
+    """
+    
+    def __init__(self, capacity: int, width: int = 1):
+        self.capacity = capacity
+        # Every sample is written twice (i and i + capacity) so the most
+        # recent samples are always available as one contiguous slice
+        self._buffer = np.zeros((width, capacity * 2), dtype=np.float64)
+        self._head = 0
+        self._count = 0
+        
+    def __len__(self) -> int:
+        return self._count
+        
+    def append(self, values):
+        """Store a sample (one value per row), overwriting the oldest when full"""
+        self._buffer[:, self._head] = values
+        self._buffer[:, self._head + self.capacity] = values
+        self._head = (self._head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+            
+    def last(self, n: int) -> np.ndarray:
+        """Return a (width, n) view of the last n samples, oldest first"""
+        n = min(n, self._count)
+        end = self._head + self.capacity
+        return self._buffer[:, end - n:end]
+        
+    def truncate(self, n: int):
+        """Forget all but the last n samples"""
+        self._count = min(self._count, n)
+
+
 class PerformanceOptimizer:
     """Optimizes application performance and resource usage"""
     
+    # Widget colour bands: (upper bounds, colours), green below the first bound
+    WIDGET_COLORS = ('green', 'orange', 'red')
+    CPU_COLOR_BOUNDS = (10, 20)
+    MEMORY_COLOR_BOUNDS = (50, 100)
+    UI_RESPONSE_COLOR_BOUNDS = (0.05, 0.1)
+    
+    # Optional app components the optimizer works with
+    APP_CAPABILITIES = ('market_api', 'session_tracker', 'results_text', 'status_label')
+    
     def __init__(self, app_instance):
         self.app = weakref.ref(app_instance)  # Weak reference to avoid circular refs
-        self.metrics_history = []
+        self.metrics_history = deque(maxlen=100)  # Keeps only last 100 measurements
+        
+        # Per-metric sample history used for report statistics
+        # Rows: cpu_usage, memory_mb, ui_response_time
+        self._metric_ring = MetricRing(100, width=3)
+        
+        # Guards the sample history and report cache; the GIL alone doesn't
+        # serialize these on free-threaded builds
+        self._metrics_lock = threading.Lock()
+        
+        # Report statistics are reused until a new sample arrives
+        self._sample_seq = 0
+        self._report_seq = -1
+        self._report_cache = None
         self.monitoring_active = False
         self.optimization_callbacks = []
+        self._caps = None
+        self._tick_id = None
+        self._next_tick_due = None
+        self._ui_lag = 0.0
+        
+        # Market API latency is probed at most once a minute
+        self.market_probe_interval = 60.0
+        self._last_market_probe = 0.0
+        self._market_latency = 0.0
+        
+        # Pending optimize_ui callbacks, so repeated calls replace them
+        self._ui_after_ids = {}
+        self._last_ui_optimization = 0.0
         
         # Performance thresholds
         self.cpu_threshold = 15.0  # Max 15% CPU usage
@@ -55,6 +162,21 @@ class PerformanceOptimizer:
             'cache_management': self.manage_caches
         }
         
+        # Optionally take psutil samples in a child process so sampling never
+        # competes with the UI for the GIL. Costs a second interpreter, so
+        # it's off by default; frozen builds also need freeze_support()
+        self.sample_in_subprocess = False
+        self._sampler = None
+        self._sampler_queue = None
+        self._sampler_sample = None
+        
+        # Reuse a single Process handle for every sample
+        self._process = psutil.Process() if PSUTIL_AVAILABLE else None
+        if self._process is not None:
+            # The first non-blocking cpu_percent() call always returns 0.0;
+            # prime it so the first sample covers the first tick interval
+            self._process.cpu_percent(interval=None)
+        
     def start_monitoring(self):
         """Start performance monitoring"""
         if self.monitoring_active:
@@ -62,84 +184,177 @@ class PerformanceOptimizer:
             
         self.monitoring_active = True
         
-        def monitor_loop():
-            while self.monitoring_active:
-                try:
-                    metrics = self.collect_metrics()
-                    self.metrics_history.append(metrics)
-                    
-                    # Keep only last 100 measurements
-                    if len(self.metrics_history) > 100:
-                        self.metrics_history.pop(0)
-                    
-                    # Check if optimization is needed
-                    self.check_optimization_triggers(metrics)
-                    
-                    time.sleep(5)  # Check every 5 seconds
-                    
-                except Exception as e:
-                    print(f"Performance monitoring error: {e}")
-                    time.sleep(10)
-                    
-        thread = threading.Thread(target=monitor_loop, daemon=True)
-        thread.start()
+        if self.sample_in_subprocess and PSUTIL_AVAILABLE:
+            self._start_sampler()
+            
+        # Sampling runs on the Tk event loop so every widget call stays on
+        # the main thread
+        self._schedule_tick(0)
         
     def stop_monitoring(self):
         """Stop performance monitoring"""
         self.monitoring_active = False
         
+        if self._tick_id is not None:
+            try:
+                self.app().root.after_cancel(self._tick_id)
+            except Exception:
+                pass
+            self._tick_id = None
+            
+        self._stop_sampler()
+            
+    def _start_sampler(self):
+        """Start the child process that samples this process"""
+        self._sampler_queue = multiprocessing.Queue()
+        self._sampler = multiprocessing.Process(
+            target=_monitor_main,
+            args=(os.getpid(), self._sampler_queue, 5.0),
+            name='perf-sampler',
+            daemon=True
+        )
+        self._sampler.start()
+        
+    def _stop_sampler(self):
+        """Stop the sampling child process, if running"""
+        if self._sampler is None:
+            return
+        self._sampler.terminate()
+        self._sampler.join(timeout=1)
+        self._sampler_queue.close()
+        self._sampler = None
+        self._sampler_queue = None
+        self._sampler_sample = None
+        
+    def _drain_sampler(self) -> Optional[tuple]:
+        """Return the newest sample posted by the child process"""
+        try:
+            while True:
+                self._sampler_sample = self._sampler_queue.get_nowait()
+        except queue.Empty:
+            pass
+        return self._sampler_sample
+        
+    def _schedule_tick(self, delay_ms: int):
+        """Schedule the next monitoring tick"""
+        app = self.app()
+        if self.monitoring_active and app and app.root:
+            self._next_tick_due = time.monotonic() + delay_ms / 1000
+            self._tick_id = app.root.after(delay_ms, self._tick)
+        else:
+            self._tick_id = None
+            
+    def _tick(self):
+        """Take one metrics sample and reschedule"""
+        self._tick_id = None
+        if not self.monitoring_active:
+            return
+            
+        # How late the event loop ran this callback is the UI lag
+        now = time.monotonic()
+        if self._next_tick_due is not None:
+            self._ui_lag = max(0.0, now - self._next_tick_due)
+            
+        if now - self._last_market_probe > self.market_probe_interval:
+            self._last_market_probe = now
+            self._probe_market_latency()
+            
+        # Reschedule even if the sample raises, so an unexpected error is
+        # reported by Tk without ending monitoring
+        try:
+            metrics = self.collect_metrics()
+        except SAMPLE_ERRORS as e:
+            logger.debug("metric sample skipped: %s", e)
+        else:
+            self.record_metrics(metrics)
+            
+            # Check if optimization is needed
+            self.check_optimization_triggers(metrics)
+        finally:
+            self._schedule_tick(5000)  # Check every 5 seconds
+        
+    def record_metrics(self, metrics: PerformanceMetrics):
+        """Add a sample to the metrics history"""
+        with self._metrics_lock:
+            self.metrics_history.append(metrics)
+            self._metric_ring.append((metrics.cpu_usage, metrics.memory_mb,
+                                      metrics.ui_response_time))
+            self._sample_seq += 1
+        
+    def latest(self) -> Optional[PerformanceMetrics]:
+        """Return the most recent sample, if any"""
+        with self._metrics_lock:
+            return self.metrics_history[-1] if self.metrics_history else None
+        
+    def _get_caps(self) -> Dict[str, bool]:
+        """Return which optional app components exist (resolved once)"""
+        # The app's shape doesn't change once its UI is built, and the
+        # first monitor tick only runs after the main loop has started
+        if self._caps is None:
+            app = self.app()
+            if not app:
+                return dict.fromkeys(self.APP_CAPABILITIES, False)
+            self._caps = {name: hasattr(app, name) for name in self.APP_CAPABILITIES}
+        return self._caps
+        
+    def _probe_market_latency(self):
+        """Time a market API status call"""
+        app = self.app()
+        if not app or not self._get_caps()['market_api']:
+            return
+            
+        try:
+            start_time = time.perf_counter()
+            # Quick connectivity check
+            app.market_api.get_api_status()
+            latency = time.perf_counter() - start_time
+        except Exception:
+            latency = -1.0  # Error indicator
+            
+        self._market_latency = latency
+            
     def collect_metrics(self) -> PerformanceMetrics:
         """Collect current performance metrics"""
-        try:
-            if PSUTIL_AVAILABLE:
-                process = psutil.Process()
-                
+        sample = self._drain_sampler() if self._sampler is not None else None
+        
+        if sample is not None:
+            cpu_usage, memory_percent, memory_mb, thread_count = sample
+        elif self._process is not None:
+            process = self._process
+            
+            # oneshot() coalesces the /proc reads behind these calls
+            with process.oneshot():
                 # CPU and memory usage
-                cpu_usage = process.cpu_percent()
+                cpu_usage = process.cpu_percent(interval=None)  # Since previous sample
                 memory_info = process.memory_info()
                 memory_mb = memory_info.rss / 1024 / 1024
                 memory_percent = process.memory_percent()
                 
                 # Thread count
                 thread_count = process.num_threads()
-            else:
-                # Fallback values when psutil is not available
-                cpu_usage = 0.0
-                memory_mb = 0.0
-                memory_percent = 0.0
-                thread_count = threading.active_count()
-            
-            # UI response time (simplified)
-            ui_start = time.time()
-            if self.app() and self.app().root:
-                self.app().root.update_idletasks()
-            ui_response_time = time.time() - ui_start
-            
-            # Market API latency (if available)
-            market_latency = 0.0
-            if self.app() and hasattr(self.app(), 'market_api'):
-                try:
-                    start_time = time.time()
-                    # Quick connectivity check
-                    status = self.app().market_api.get_api_status()
-                    market_latency = time.time() - start_time
-                except Exception:
-                    market_latency = -1.0  # Error indicator
-            
-            return PerformanceMetrics(
-                cpu_usage=cpu_usage,
-                memory_usage=memory_percent,
-                memory_mb=memory_mb,
-                thread_count=thread_count,
-                ui_response_time=ui_response_time,
-                market_api_latency=market_latency,
-                timestamp=datetime.now()
-            )
-            
-        except Exception as e:
-            print(f"Error collecting metrics: {e}")
-            return PerformanceMetrics(0, 0, 0, 0, 0, 0, datetime.now())
-            
+        else:
+            # Fallback values when psutil is not available
+            cpu_usage = 0.0
+            memory_mb = 0.0
+            memory_percent = 0.0
+            thread_count = threading.active_count()
+        
+        # UI response time, measured passively from tick lateness
+        ui_response_time = self._ui_lag
+        
+        # Market API latency from the last probe
+        market_latency = self._market_latency
+        
+        return PerformanceMetrics(
+            cpu_usage=cpu_usage,
+            memory_usage=memory_percent,
+            memory_mb=memory_mb,
+            thread_count=thread_count,
+            ui_response_time=ui_response_time,
+            market_api_latency=market_latency,
+            timestamp=datetime.now()
+        )
+        
     def check_optimization_triggers(self, metrics: PerformanceMetrics):
         """Check if optimization is needed based on metrics"""
         optimizations_needed = []
@@ -171,23 +386,32 @@ class PerformanceOptimizer:
     def cleanup_memory(self):
         """Clean up memory usage"""
         try:
-            # Force garbage collection
-            gc.collect()
+            # Routine cleanup only collects the youngest generation; a full
+            # collection pauses the UI, so keep it for real memory pressure
+            latest = self.latest()
+            if latest is not None and latest.memory_mb > self.memory_threshold * 2:
+                gc.collect(2)
+            else:
+                gc.collect(0)
             
             # Clear old metrics history if too large
-            if len(self.metrics_history) > 20:
-                self.metrics_history = self.metrics_history[-20:]
+            with self._metrics_lock:
+                while len(self.metrics_history) > 20:
+                    self.metrics_history.popleft()
+                self._metric_ring.truncate(20)
+                self._report_cache = None
+                self._report_seq = -1
                 
             # Clear market API cache if available
-            if self.app() and hasattr(self.app(), 'market_api'):
+            if self.app() and self._get_caps()['market_api']:
                 # Clear old currency data
                 market_api = self.app().market_api
                 if hasattr(market_api, 'currency_data'):
-                    # Keep only essential currency data
-                    essential_currencies = ['Chaos Orb', 'Divine Orb', 'Exalted Orb']
-                    if len(market_api.currency_data) > len(essential_currencies) * 2:
-                        market_api.currency_data = {k: v for k, v in market_api.currency_data.items() 
-                                                   if k in essential_currencies}
+                    # Keep only essential currency data, shrinking the dict in
+                    # place rather than building a filtered copy
+                    currency_data = market_api.currency_data
+                    for name in [k for k in currency_data if k not in ESSENTIAL_CURRENCIES]:
+                        del currency_data[name]
                                                    
             print("Memory cleanup completed")
             
@@ -200,18 +424,28 @@ class PerformanceOptimizer:
             if not self.app() or not self.app().root:
                 return
                 
+            # Skip if we optimized recently; under sustained load every
+            # sample would otherwise queue another round of callbacks
+            now = time.monotonic()
+            if now - self._last_ui_optimization < self.ui_response_threshold * 10:
+                return
+            self._last_ui_optimization = now
+                
             app = self.app()
+            caps = self._get_caps()
             
             # Reduce update frequency for heavy elements
-            if hasattr(app, 'results_text'):
+            if caps['results_text']:
                 # Temporarily disable text widget updates
                 app.results_text.config(state='disabled')
-                app.root.after(100, lambda: app.results_text.config(state='normal'))
+                self._schedule_ui_callback(app.root, 'results_enable', 100,
+                                           lambda: app.results_text.config(state='normal'))
                 
             # Optimize overlay updates
-            if hasattr(app, 'status_label'):
+            if caps['status_label']:
                 # Update status less frequently
-                app.root.after(10000, app.update_price_status)  # 10 seconds instead of immediate
+                self._schedule_ui_callback(app.root, 'status_refresh', 10000,
+                                           app.update_price_status)  # 10 seconds instead of immediate
                 
             # Force UI cleanup
             app.root.update_idletasks()
@@ -221,6 +455,21 @@ class PerformanceOptimizer:
         except Exception as e:
             print(f"UI optimization error: {e}")
             
+    def _schedule_ui_callback(self, root: tk.Misc, key: str, delay_ms: int, callback: Callable):
+        """Schedule a callback, replacing any pending one with the same key"""
+        after_id = self._ui_after_ids.pop(key, None)
+        if after_id is not None:
+            try:
+                root.after_cancel(after_id)
+            except tk.TclError:
+                pass
+                
+        def run():
+            self._ui_after_ids.pop(key, None)
+            callback()
+            
+        self._ui_after_ids[key] = root.after(delay_ms, run)
+        
     def throttle_background_tasks(self):
         """Throttle background tasks to reduce CPU usage"""
         try:
@@ -230,7 +479,7 @@ class PerformanceOptimizer:
             app = self.app()
             
             # Increase price update interval temporarily
-            if hasattr(app, 'market_api'):
+            if self._get_caps()['market_api']:
                 old_interval = app.market_api.update_interval
                 app.market_api.update_interval = min(old_interval * 2, 1800)  # Max 30 minutes
                 
@@ -255,18 +504,13 @@ class PerformanceOptimizer:
             app = self.app()
             
             # Clear session tracker cache if too large
-            if hasattr(app, 'session_tracker'):
+            caps = self._get_caps()
+            if caps['session_tracker']:
                 tracker = app.session_tracker
                 if hasattr(tracker, 'get_session_history'):
                     # Limit session history in memory
                     recent_sessions = tracker.get_session_history(10)  # Keep only 10 recent
                     
-            # Clear modifier database cache if available
-            if hasattr(app, 'modifier_database'):
-                # Keep only essential modifiers
-                essential_mods = ['Maximum Life', 'Energy Shield', 'Resistances']
-                # This is just an example - actual implementation would depend on structure
-                
             print("Cache management completed")
             
         except Exception as e:
@@ -274,19 +518,30 @@ class PerformanceOptimizer:
             
     def get_performance_report(self) -> Dict[str, Any]:
         """Generate performance report"""
-        if not self.metrics_history:
-            return {'error': 'No metrics available'}
-            
-        recent_metrics = self.metrics_history[-10:]  # Last 10 measurements
+        with self._metrics_lock:
+            if not self.metrics_history or not len(self._metric_ring):
+                return {'error': 'No metrics available'}
+                
+            if self._report_seq != self._sample_seq or self._report_cache is None:
+                self._report_cache = self._compute_report_stats()
+                self._report_seq = self._sample_seq
+            report = self._report_cache
+            
+        return dict(report,
+                    monitoring_active=self.monitoring_active,
+                    timestamp=datetime.now().isoformat())
+        
+    def _compute_report_stats(self) -> Dict[str, Any]:
+        """Compute the sample-dependent part of the performance report
+        (caller holds _metrics_lock)"""
+        # Last 10 measurements
+        recent = self._metric_ring.last(10)
         
         # Calculate averages
-        avg_cpu = sum(m.cpu_usage for m in recent_metrics) / len(recent_metrics)
-        avg_memory = sum(m.memory_mb for m in recent_metrics) / len(recent_metrics)
-        avg_ui_response = sum(m.ui_response_time for m in recent_metrics) / len(recent_metrics)
+        avg_cpu, avg_memory, avg_ui_response = recent.mean(axis=1).tolist()
         
         # Find peak usage
-        peak_cpu = max(m.cpu_usage for m in recent_metrics)
-        peak_memory = max(m.memory_mb for m in recent_metrics)
+        peak_cpu, peak_memory, _ = recent.max(axis=1).tolist()
         
         # Performance status
         status = 'good'
@@ -302,34 +557,21 @@ class PerformanceOptimizer:
             'average_ui_response_ms': avg_ui_response * 1000,
             'peak_cpu_usage': peak_cpu,
             'peak_memory_mb': peak_memory,
-            'total_measurements': len(self.metrics_history),
-            'monitoring_active': self.monitoring_active,
-            'timestamp': datetime.now().isoformat()
+            'total_measurements': len(self.metrics_history)
         }
         
     def optimize_on_startup(self):
         """Perform startup optimizations"""
         try:
             # Set process priority to normal (not high)
-            if PSUTIL_AVAILABLE:
+            if self._process is not None:
                 try:
-                    process = psutil.Process()
-                    process.nice(0)  # Normal priority
+                    # Normal priority; only write it if it isn't already set
+                    if self._process.nice() != 0:
+                        self._process.nice(0)
                 except Exception:
                     pass
                 
-            # Optimize garbage collection
-            gc.set_threshold(700, 10, 10)  # More aggressive GC
-            
-            # Pre-allocate common objects to reduce allocation overhead
-            self.common_strings = {
-                'chaos_orb': 'Chaos Orb',
-                'divine_orb': 'Divine Orb',
-                'exalted_orb': 'Exalted Orb',
-                'success': 'Success',
-                'failed': 'Failed'
-            }
-            
             print("Startup optimizations applied")
             
         except Exception as e:
@@ -346,6 +588,7 @@ class PerformanceOptimizer:
             
             # Metrics display
             self.perf_labels = {}
+            self._last_widget_state = {}
             metrics = ['CPU', 'Memory', 'UI Response']
             
             for metric in metrics:
@@ -379,18 +622,17 @@ class PerformanceOptimizer:
             if not hasattr(self, 'perf_labels'):
                 return
                 
-            if self.metrics_history:
-                latest = self.metrics_history[-1]
+            latest = self.latest()
+            if latest is not None:
+                colors = self.WIDGET_COLORS
                 
                 # Update labels with color coding
-                cpu_color = 'green' if latest.cpu_usage < 10 else 'orange' if latest.cpu_usage < 20 else 'red'
-                self.perf_labels['CPU'].config(text=f"{latest.cpu_usage:.1f}%", fg=cpu_color)
-                
-                mem_color = 'green' if latest.memory_mb < 50 else 'orange' if latest.memory_mb < 100 else 'red'
-                self.perf_labels['Memory'].config(text=f"{latest.memory_mb:.1f}MB", fg=mem_color)
-                
-                ui_color = 'green' if latest.ui_response_time < 0.05 else 'orange' if latest.ui_response_time < 0.1 else 'red'
-                self.perf_labels['UI Response'].config(text=f"{latest.ui_response_time*1000:.0f}ms", fg=ui_color)
+                self._set_perf_label('CPU', f"{latest.cpu_usage:.1f}%",
+                                     colors[bisect_right(self.CPU_COLOR_BOUNDS, latest.cpu_usage)])
+                self._set_perf_label('Memory', f"{latest.memory_mb:.1f}MB",
+                                     colors[bisect_right(self.MEMORY_COLOR_BOUNDS, latest.memory_mb)])
+                self._set_perf_label('UI Response', f"{latest.ui_response_time*1000:.0f}ms",
+                                     colors[bisect_right(self.UI_RESPONSE_COLOR_BOUNDS, latest.ui_response_time)])
                 
             # Schedule next update
             if self.app() and self.app().root:
@@ -399,6 +641,13 @@ class PerformanceOptimizer:
         except Exception as e:
             print(f"Performance widget update error: {e}")
             
+    def _set_perf_label(self, metric: str, text: str, color: str):
+        """Configure a widget label, skipping the Tk call if nothing changed"""
+        state = (text, color)
+        if self._last_widget_state.get(metric) != state:
+            self.perf_labels[metric].config(text=text, fg=color)
+            self._last_widget_state[metric] = state
+            
     def force_optimization(self):
         """Force immediate optimization"""
         try:
@@ -1,11 +1,17 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import json
+import math
 import os
 import random
+import re
+import sys
 import threading
+from bisect import bisect_right
+from functools import lru_cache
 import time
 from typing import List, Dict, Tuple, Optional
+from operator import itemgetter
 from datetime import datetime
 from market_api import poe_market, price_optimizer
 from ocr_analyzer import ItemDetectionGUI
@@ -22,16 +28,74 @@ from realtime_strategy_optimizer import realtime_optimizer
 from league_config import get_current_league_name
 from config import UI_CONFIG, CRAFTING_CONFIG, APP_CONFIG
 
+# Modifier weights are rough odds out of this many rolls
+WEIGHT_SCALE = 10000
+LOG_WEIGHT_SCALE = math.log(WEIGHT_SCALE)
+# Expected attempts are capped as if the odds were never below this
+LOG_MIN_SUCCESS_PROBABILITY = math.log(0.0001)
+
+@lru_cache(maxsize=256)
+def log_success_probability(weights: Tuple[float, ...]) -> float:
+    """Log of the chance to roll every modifier weight together"""
+    if any(weight <= 0 for weight in weights):
+        return -math.inf
+    # Summing logs can't underflow the way a product of small odds does
+    return math.fsum(math.log(weight) - LOG_WEIGHT_SCALE for weight in weights)
+
 class IntelligentPOECraftHelper:
+    # Modifier database shared by every instance; built on first use
+    _modifier_database_cache: Optional[Dict] = None
+    
+    # Divine and Exalted Orb counts by modifier count for the usual 0-6
+    # modifiers; larger counts fall back to the formulas
+    DIVINES_BY_MOD_COUNT = tuple(max(1, n // 2) for n in range(7))
+    EXALTS_BY_MOD_COUNT = tuple(max(0, n - 1) for n in range(7))
+    
+    # Fixed plan text sections
+    FOSSIL_STEPS = ("STEP-BY-STEP PROCESS:\n"
+                    "1. Obtain relevant fossils for your modifiers\n"
+                    "2. Use Resonators to apply fossils to base item\n"
+                    "3. Fossils bias the outcome toward certain modifiers\n"
+                    "4. Repeat until satisfied with results\n"
+                    "5. Use Divine Orbs to perfect values\n\n")
+    FOSSIL_TIPS = ("TIPS:\n"
+                   "• Fossils increase/decrease chances of modifier types\n"
+                   "• Combine multiple fossils for better targeting\n"
+                   "• More expensive but more controlled than chaos spam\n"
+                   "• Check fossil prices and availability\n\n")
+    MASTERCRAFT_STEPS = ("STEP-BY-STEP PROCESS:\n"
+                         "1. Craft base item using other methods first\n"
+                         "2. Use Crafting Bench to add guaranteed modifiers\n"
+                         "3. Mastercrafted mods can be changed at any time\n"
+                         "4. Consider this for final modifier slots\n\n")
+    MASTERCRAFT_TIPS = ("TIPS:\n"
+                        "• Only use for modifiers available on crafting bench\n"
+                        "• Leaves item with 'Crafted' modifier\n"
+                        "• Can be removed with Orb of Scouring\n"
+                        "• Great for finishing touches\n\n")
+    GENERAL_TIPS = ("GENERAL TIPS:\n"
+                    "• Always check item level requirements\n"
+                    "• Consider using Orb of Scouring to start over\n"
+                    "• Divine Orbs reroll numeric values\n"
+                    "• Annulment Orbs can remove unwanted modifiers\n"
+                    "• Use PoE wiki/craft of exile for detailed info\n"
+                    "• Consider influenced items for special modifiers\n")
+    
     def __init__(self):
         self.root = tk.Tk()
         self.root.title(f"{APP_CONFIG['name']} - {get_current_league_name()}")
         self.root.geometry(UI_CONFIG['window_size'])
-        self.root.attributes('-topmost', UI_CONFIG['topmost'])
+        # Tracked locally so toggling doesn't have to query Tk
+        self._topmost = bool(UI_CONFIG['topmost'])
+        self.root.attributes('-topmost', self._topmost)
         self.root.attributes('-alpha', UI_CONFIG['default_opacity'])
         
         # Comprehensive modifier database
         self.modifier_database = self.load_modifier_database()
+        self._init_modifier_lookups()
+        
+        # Price-independent plan sections by their inputs
+        self._plan_cache: Dict[tuple, Tuple[str, str, str]] = {}
         
         # Dynamic currency costs (updated from market API)
         self.market_api = poe_market
@@ -73,7 +137,9 @@ class IntelligentPOECraftHelper:
         optimize_tkinter_performance(self.root)
         self.performance_optimizer = initialize_performance_optimizer(self)
         
-        self.setup_ui()
+        # Widgets are built on first show() so the analysis methods can be
+        # used without paying for the full UI
+        self._ui_built = False
     
     def start_price_updater(self):
         """Start background price updater for real-time market data"""
@@ -107,10 +173,18 @@ class IntelligentPOECraftHelper:
         
     def load_modifier_database(self) -> Dict:
         """Load comprehensive modifier database with enhanced recognition patterns"""
-        return {
+        cls = type(self)
+        if cls._modifier_database_cache is None:
+            cls._modifier_database_cache = self._build_modifier_database()
+        return cls._modifier_database_cache
+    
+    def _build_modifier_database(self) -> Dict:
+        """Build the modifier database and its precomputed lookup fields"""
+        database = {
             # Life modifiers
             'Maximum Life': {
                 'type': 'prefix',
+                'priority': 1,  # Essence priority
                 'tiers': [
                     {'name': 'T1', 'value': '+100 to +120', 'weight': 100, 'ilvl': 85},
                     {'name': 'T2', 'value': '+80 to +99', 'weight': 200, 'ilvl': 70},
@@ -126,6 +200,7 @@ class IntelligentPOECraftHelper:
             # ES modifiers
             'Maximum Energy Shield': {
                 'type': 'prefix',
+                'priority': 2,
                 'tiers': [
                     {'name': 'T1', 'value': '+100 to +120', 'weight': 100, 'ilvl': 85},
                     {'name': 'T2', 'value': '+80 to +99', 'weight': 200, 'ilvl': 70},
@@ -141,6 +216,7 @@ class IntelligentPOECraftHelper:
             # Attack Speed
             'Attack Speed': {
                 'type': 'suffix',
+                'priority': 3,
                 'aliases': ['increased attack speed', 'attack speed increased', 'AS', 'ias', 'increased ias', 'attack speed %', '% attack speed', 'local attack speed', 'weapon attack speed'],
                 'patterns': [r'attack\s*speed', r'\+\d+%?\s*attack\s*speed', r'increased\s*attack\s*speed', r'\bias\b', r'ias\s*\+?\d*%?'],
                 'tiers': [
@@ -158,6 +234,7 @@ class IntelligentPOECraftHelper:
             # Critical Strike Chance
             'Critical Strike Chance': {
                 'type': 'suffix',
+                'priority': 4,
                 'aliases': ['critical strike chance', 'crit chance', 'critical chance', 'crit', 'increased critical strike chance', 'crit strike chance', '% critical strike chance', 'critical strike chance %', 'local critical strike chance'],
                 'patterns': [r'crit(?:ical)?\s*(?:strike)?\s*chance', r'\+\d+%?\s*crit(?:ical)?\s*(?:strike)?\s*chance', r'increased\s*crit(?:ical)?\s*(?:strike)?\s*chance', r'\bcrit\b', r'critical\s*strike'],
                 'tiers': [
@@ -175,6 +252,7 @@ class IntelligentPOECraftHelper:
             # Elemental Damage
             'Elemental Damage': {
                 'type': 'prefix',
+                'priority': 5,
                 'tiers': [
                     {'name': 'T1', 'value': '+25% to +30%', 'weight': 100, 'ilvl': 85},
                     {'name': 'T2', 'value': '+20% to +24%', 'weight': 200, 'ilvl': 70},
@@ -190,6 +268,7 @@ class IntelligentPOECraftHelper:
             # Movement Speed
             'Movement Speed': {
                 'type': 'suffix',
+                'priority': 6,
                 'tiers': [
                     {'name': 'T1', 'value': '+25% to +30%', 'weight': 100, 'ilvl': 85},
                     {'name': 'T2', 'value': '+20% to +24%', 'weight': 200, 'ilvl': 70},
@@ -202,56 +281,146 @@ class IntelligentPOECraftHelper:
                 'fossils': ['Jagged Fossil']
             }
         }
+        
+        # Precompute lookup data used by normalize_modifier_name
+        for mod_name, mod_data in database.items():
+            mod_data['_name_lower'] = mod_name.lower()
+            
+            # Tiers by ascending ilvl for bisect lookups of the best tier an
+            # item level allows; on equal ilvl the earlier-listed tier wins
+            tiers_by_ilvl = sorted(enumerate(mod_data['tiers']),
+                                   key=lambda item: (item[1]['ilvl'], -item[0]))
+            mod_data['_tiers_by_ilvl'] = [tier for _, tier in tiers_by_ilvl]
+            mod_data['_tier_ilvls'] = [tier['ilvl'] for _, tier in tiers_by_ilvl]
+            
+            # Fossil list as shown in fossil plan recommendations
+            mod_data['_fossils_text'] = ', '.join(mod_data.get('fossils', ('Unknown',)))
+            
+            # Names with spaces aren't interned by the compiler; interning
+            # them lets lookups and comparisons hit the identity fast path
+            mod_data['type'] = sys.intern(mod_data['type'])
+            if 'essence' in mod_data:
+                mod_data['essence'] = sys.intern(mod_data['essence'])
+        
+        return {sys.intern(mod_name): mod_data for mod_name, mod_data in database.items()}
+    
+    def _init_modifier_lookups(self):
+        """Build lookup tables used by normalize_modifier_name"""
+        # Lowercased names and aliases -> canonical name. Names are added
+        # last so they take precedence over any alias of another modifier
+        self._alias_index: Dict[str, str] = {}
+        for mod_name, mod_data in self.modifier_database.items():
+            for alias in mod_data.get('aliases', []):
+                self._alias_index.setdefault(alias.lower(), mod_name)
+        for mod_name, mod_data in self.modifier_database.items():
+            self._alias_index[mod_data['_name_lower']] = mod_name
+        
+        # All recognition patterns as one regex. Each modifier contributes an
+        # alternative anchored at the start with a lookahead, so the regex
+        # engine tries modifiers in database order and lastgroup names the
+        # first one with any pattern matching anywhere in the input. Classes
+        # stay Unicode-aware: typed or OCR'd input may carry NBSP and other
+        # non-ASCII whitespace that \s has to match
+        alternatives = []
+        self._pattern_groups: Dict[str, str] = {}
+        for i, (mod_name, mod_data) in enumerate(self.modifier_database.items()):
+            if mod_data.get('patterns'):
+                group = f'm{i}'
+                self._pattern_groups[group] = mod_name
+                combined = '|'.join(f'(?:{p})' for p in mod_data['patterns'])
+                alternatives.append(f'(?=.*?(?:{combined}))(?P<{group}>)')
+        self._pattern_matcher = re.compile('|'.join(alternatives) or r'(?!)',
+                                           re.IGNORECASE | re.DOTALL)
+        
+        # Word sets for the fuzzy fallback with the overlap each one needs,
+        # plus a 64-bit character mask used to skip hopeless candidates. Any
+        # shared word puts all of its bits in both masks, so a candidate
+        # sharing fewer bits than its sparsest word can't match
+        self._fuzzy_words = []
+        for mod_name, mod_data in self.modifier_database.items():
+            mod_words = frozenset(mod_data['_name_lower'].split())
+            word_masks = [self._char_mask(word) for word in mod_words]
+            char_mask = 0
+            for mask in word_masks:
+                char_mask |= mask
+            min_shared_bits = min((bin(mask).count('1') for mask in word_masks), default=0)
+            self._fuzzy_words.append((mod_name, mod_words, min(len(mod_words), 2),
+                                      char_mask, min(min_shared_bits, 2)))
+        
+        # Results of normalize_modifier_name by raw input string
+        self._norm_cache: Dict[str, str] = {}
+        
+        # Modifier names by type, in database order, for suggest_alternatives
+        self._mods_by_type: Dict[str, List[str]] = {}
+        for mod_name, mod_data in self.modifier_database.items():
+            self._mods_by_type.setdefault(mod_data['type'], []).append(mod_name)
+    
+    @staticmethod
+    def _char_mask(text: str) -> int:
+        """64-bit mask with one bit set per character of text"""
+        mask = 0
+        for char in text:
+            mask |= 1 << (ord(char) & 63)
+        return mask
     
     def normalize_modifier_name(self, input_modifier: str) -> str:
         """Enhanced modifier name recognition with fuzzy matching"""
-        import re
-        
+        cached = self._norm_cache.get(input_modifier)
+        if cached is not None:
+            return cached
+        
+        result = self._match_modifier_name(input_modifier)
+        if len(self._norm_cache) >= 1024:
+            self._norm_cache.clear()
+        self._norm_cache[input_modifier] = result
+        return result
+    
+    def _match_modifier_name(self, input_modifier: str) -> str:
+        """Uncached lookup behind normalize_modifier_name"""
         input_lower = input_modifier.lower().strip()
         
-        # Direct match first
-        for mod_name, mod_data in self.modifier_database.items():
-            if input_lower == mod_name.lower():
-                return mod_name
-        
-        # Check aliases
-        for mod_name, mod_data in self.modifier_database.items():
-            if 'aliases' in mod_data:
-                for alias in mod_data['aliases']:
-                    if input_lower == alias.lower():
-                        return mod_name
+        # Direct and alias matches
+        hit = self._alias_index.get(input_lower)
+        if hit:
+            return hit
         
         # Pattern matching with regex
-        for mod_name, mod_data in self.modifier_database.items():
-            if 'patterns' in mod_data:
-                for pattern in mod_data['patterns']:
-                    if re.search(pattern, input_lower, re.IGNORECASE):
-                        return mod_name
+        match = self._pattern_matcher.match(input_lower)
+        if match:
+            return self._pattern_groups[match.lastgroup]
         
         # Fuzzy partial matching for common variations
-        for mod_name, mod_data in self.modifier_database.items():
-            mod_words = set(mod_name.lower().split())
-            input_words = set(input_lower.split())
-            
+        input_words = set(input_lower.split())
+        input_mask = self._char_mask(''.join(input_words))
+        for mod_name, mod_words, required_overlap, char_mask, min_shared_bits in self._fuzzy_words:
+            if required_overlap and bin(char_mask & input_mask).count('1') < min_shared_bits:
+                continue
             # If significant word overlap, consider it a match
-            if len(mod_words.intersection(input_words)) >= min(len(mod_words), 2):
+            if len(mod_words & input_words) >= required_overlap:
                 return mod_name
         
         # Return original if no match found
         return input_modifier
     
-    def detect_required_essences(self, target_mods: List[str]) -> Dict:
-        """Automatically detect which essences are needed for target modifiers"""
+    def detect_required_essences(self, target_mods: List[str],
+                                 normalized_mods: Optional[List[str]] = None) -> Dict:
+        """Automatically detect which essences are needed for target modifiers
+        
+        Pass normalized_mods when the names have already been normalized
+        (e.g. by analyze_modifiers) to skip doing it again.
+        """
         essence_requirements = {
             'guaranteed_mods': [],
             'required_essences': [],
             'essence_priorities': [],
             'non_essence_mods': []
         }
+        seen_essences = set()
         
-        for mod_name in target_mods:
-            normalized_mod = self.normalize_modifier_name(mod_name)
-            
+        if normalized_mods is None:
+            normalized_mods = [self.normalize_modifier_name(m) for m in target_mods]
+        
+        for normalized_mod in normalized_mods:
             if normalized_mod in self.modifier_database:
                 mod_data = self.modifier_database[normalized_mod]
                 
@@ -259,11 +428,14 @@ class IntelligentPOECraftHelper:
                     essence_requirements['guaranteed_mods'].append({
                         'modifier': normalized_mod,
                         'essence': mod_data['essence'],
-                        'type': mod_data['type']
+                        'type': mod_data['type'],
+                        'priority': mod_data.get('priority', 999)
                     })
                     
-                    if mod_data['essence'] not in essence_requirements['required_essences']:
-                        essence_requirements['required_essences'].append(mod_data['essence'])
+                    essence = mod_data['essence']
+                    if essence not in seen_essences:
+                        seen_essences.add(essence)
+                        essence_requirements['required_essences'].append(essence)
                 else:
                     essence_requirements['non_essence_mods'].append(normalized_mod)
         
@@ -274,19 +446,7 @@ class IntelligentPOECraftHelper:
     
     def _prioritize_essences(self, guaranteed_mods: List[Dict]) -> List[Dict]:
         """Prioritize essences based on modifier importance and rarity"""
-        priority_order = {
-            'Maximum Life': 1,
-            'Maximum Energy Shield': 2,
-            'Attack Speed': 3,
-            'Critical Strike Chance': 4,
-            'Elemental Damage': 5,
-            'Movement Speed': 6
-        }
-        
-        prioritized = sorted(guaranteed_mods, 
-                           key=lambda x: priority_order.get(x['modifier'], 999))
-        
-        return prioritized
+        return sorted(guaranteed_mods, key=itemgetter('priority'))
         
     def setup_ui(self):
         # Title
@@ -491,34 +651,41 @@ class IntelligentPOECraftHelper:
         # Use AI optimizer if method is auto
         if method == "auto":
             ai_plan = self.ai_optimizer.generate_adaptive_plan(scenario)
-            plan = self.format_ai_plan(ai_plan)
+            parts = [self.format_ai_plan(ai_plan)]
             # Add probability analysis to AI plan
-            plan += self.format_probability_analysis(probability_analysis)
+            parts.append(self.format_probability_analysis(probability_analysis))
         else:
             # Enhanced analysis with probability engine
-            modifier_analysis = self.analyze_modifiers(target_mods, ilvl)
-            plan = self.generate_detailed_plan(base_item, target_mods, method, modifier_analysis, budget, ilvl)
+            normalized_mods = [self.normalize_modifier_name(m) for m in target_mods]
+            modifier_analysis = self.analyze_modifiers(target_mods, ilvl, normalized_mods)
+            parts = [self.generate_detailed_plan(base_item, target_mods, method, modifier_analysis, budget, ilvl)]
             # Add detailed probability analysis
-            plan += self.format_probability_analysis(probability_analysis)
+            parts.append(self.format_probability_analysis(probability_analysis))
         
         # Add comprehensive intelligent recommendations
-        plan += self.generate_comprehensive_recommendations(base_item, target_mods, budget, ilvl)
+        parts.append(self.generate_comprehensive_recommendations(base_item, target_mods, budget, ilvl))
         
         # Start crafting session tracking
         session_id = self.start_crafting_session(base_item, target_mods, method, budget)
         
         # Add session info to plan
         if session_id:
-            plan += f"\n📊 SESSION TRACKING:\n"
-            plan += f"Session ID: {session_id}\n"
-            plan += f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-            plan += f"Use the Analytics button to track your progress!\n"
+            parts.append(f"\n📊 SESSION TRACKING:\n")
+            parts.append(f"Session ID: {session_id}\n")
+            parts.append(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            parts.append(f"Use the Analytics button to track your progress!\n")
         
+        # One replace of the widget contents with the whole plan
         self.results_text.delete("1.0", tk.END)
-        self.results_text.insert("1.0", plan)
+        self.results_text.insert("1.0", "".join(parts))
+        
+    def analyze_modifiers(self, target_mods: List[str], ilvl: int,
+                          normalized_mods: Optional[List[str]] = None) -> Dict:
+        """Analyze target modifiers for compatibility and requirements with enhanced recognition
         
-    def analyze_modifiers(self, target_mods: List[str], ilvl: int) -> Dict:
-        """Analyze target modifiers for compatibility and requirements with enhanced recognition"""
+        normalized_mods, if given, holds the already normalized names of
+        target_mods in the same order.
+        """
         analysis = {
             'modifiers': [],
             'prefix_count': 0,
@@ -530,42 +697,63 @@ class IntelligentPOECraftHelper:
             'recognized_modifiers': []
         }
         
-        for input_mod in target_mods:
-            # Use enhanced modifier recognition
-            normalized_mod = self.normalize_modifier_name(input_mod)
-            analysis['recognized_modifiers'].append({
+        # Use enhanced modifier recognition
+        if normalized_mods is None:
+            normalized_mods = [self.normalize_modifier_name(m) for m in target_mods]
+        
+        # Local bindings for the loop; the counters are written back after it
+        recognized = analysis['recognized_modifiers']
+        modifiers = analysis['modifiers']
+        warnings = analysis['warnings']
+        database = self.modifier_database
+        prefix_count = suffix_count = total_weight = 0
+        min_ilvl = analysis['min_ilvl']
+        
+        for input_mod, normalized_mod in zip(target_mods, normalized_mods):
+            recognized.append({
                 'input': input_mod,
                 'recognized_as': normalized_mod
             })
             
-            if normalized_mod in self.modifier_database:
-                mod_data = self.modifier_database[normalized_mod]
+            mod_data = database.get(normalized_mod)
+            if mod_data is not None:
                 mod_type = mod_data['type']
                 
                 # Count prefixes/suffixes
                 if mod_type == 'prefix':
-                    analysis['prefix_count'] += 1
+                    prefix_count += 1
                 else:
-                    analysis['suffix_count'] += 1
+                    suffix_count += 1
                     
                 # Check item level requirements
-                available_tiers = [t for t in mod_data['tiers'] if t['ilvl'] <= ilvl]
-                if available_tiers:
-                    best_tier = available_tiers[0]  # Highest tier available
-                    analysis['modifiers'].append({
+                tier_index = bisect_right(mod_data['_tier_ilvls'], ilvl) - 1
+                if tier_index >= 0:
+                    best_tier = mod_data['_tiers_by_ilvl'][tier_index]  # Highest tier available
+                    weight = best_tier['weight']
+                    modifiers.append({
                         'name': normalized_mod,
                         'input_name': input_mod,
                         'type': mod_type,
                         'best_tier': best_tier,
-                        'weight': best_tier['weight']
+                        'weight': weight
                     })
-                    analysis['total_weight'] += best_tier['weight']
-                    analysis['min_ilvl'] = max(analysis['min_ilvl'], best_tier['ilvl'])
+                    total_weight += weight
+                    if best_tier['ilvl'] > min_ilvl:
+                        min_ilvl = best_tier['ilvl']
                 else:
-                    analysis['warnings'].append(f"{normalized_mod} (input: '{input_mod}') requires higher item level than {ilvl}")
+                    warnings.append(f"{normalized_mod} (input: '{input_mod}') requires higher item level than {ilvl}")
                     
             else:
-                analysis['warnings'].append(f"Unknown modifier: '{input_mod}' (could not recognize)")
+                warnings.append(f"Unknown modifier: '{input_mod}' (could not recognize)")
+        
+        analysis['prefix_count'] = prefix_count
+        analysis['suffix_count'] = suffix_count
+        analysis['total_weight'] = total_weight
+        analysis['min_ilvl'] = min_ilvl
+        # Precomputed for the plan, cost and probability sections
+        analysis['mod_count'] = len(modifiers)
+        analysis['weights_tuple'] = tuple(mod['weight'] for mod in modifiers)
+        analysis['rendered_mods'] = self._render_target_modifiers(modifiers)
                 
         # Check compatibility (max 3 prefixes, 3 suffixes)
         if analysis['prefix_count'] > 3:
@@ -582,7 +770,7 @@ class IntelligentPOECraftHelper:
         if not analysis['compatible']:
             return "chaos_spam"  # Fallback
             
-        mod_count = len(analysis['modifiers'])
+        mod_count = analysis['mod_count']
         total_weight = analysis['total_weight']
         current_prices = self.currency_costs
         
@@ -591,7 +779,8 @@ class IntelligentPOECraftHelper:
         
         # Chaos spam method
         chaos_cost = (200 + (total_weight * 0.5)) * current_prices.get('Chaos Orb', 1.0)
-        chaos_cost += max(1, mod_count // 2) * current_prices.get('Divine Orb', 15.0)
+        divine_count = self.DIVINES_BY_MOD_COUNT[mod_count] if mod_count <= 6 else mod_count // 2
+        chaos_cost += divine_count * current_prices.get('Divine Orb', 15.0)
         chaos_cost += mod_count * current_prices.get('Orb of Annulment', 8.0)
         methods.append({
             'name': 'chaos_spam',
@@ -604,7 +793,7 @@ class IntelligentPOECraftHelper:
         if mod_count <= 2:
             alt_cost = (50 + (total_weight * 0.2)) * current_prices.get('Orb of Alteration', 0.1)
             alt_cost += mod_count * current_prices.get('Regal Orb', 2.0)
-            alt_cost += max(0, mod_count - 1) * current_prices.get('Exalted Orb', 200.0)
+            alt_cost += self.EXALTS_BY_MOD_COUNT[mod_count] * current_prices.get('Exalted Orb', 200.0)
             methods.append({
                 'name': 'alt_regal',
                 'cost': alt_cost,
@@ -651,20 +840,19 @@ class IntelligentPOECraftHelper:
         try:
             optimization = self.price_optimizer.optimize_crafting_budget(target_mods, budget)
             
-            plan = "\n🎯 BUDGET OPTIMIZATION:\n"
-            plan += "-" * 40 + "\n"
-            plan += f"Total Budget: {budget:.1f} chaos orbs\n\n"
+            parts = ["\n🎯 BUDGET OPTIMIZATION:\n" + "-" * 40 + "\n"]
+            parts.append(f"Total Budget: {budget:.1f} chaos orbs\n\n")
             
-            plan += "RECOMMENDED ALLOCATION:\n"
+            parts.append("RECOMMENDED ALLOCATION:\n")
             for currency, details in optimization.get('allocation', {}).items():
-                plan += f"• {currency}: {details['currency_amount']:.1f} units ({details['chaos_allocated']:.1f}c)\n"
+                parts.append(f"• {currency}: {details['currency_amount']:.1f} units ({details['chaos_allocated']:.1f}c)\n")
                 
             remaining = optimization.get('remaining_budget', 0)
             if remaining > 0:
-                plan += f"\nRemaining Budget: {remaining:.1f}c (for contingencies)\n"
+                parts.append(f"\nRemaining Budget: {remaining:.1f}c (for contingencies)\n")
                 
-            plan += f"\nOptimization calculated at: {optimization.get('optimization_timestamp', 'Unknown')}\n"
-            return plan
+            parts.append(f"\nOptimization calculated at: {optimization.get('optimization_timestamp', 'Unknown')}\n")
+            return "".join(parts)
             
         except Exception as e:
             return f"\n⚠ Budget optimization failed: {e}\n"
@@ -672,257 +860,285 @@ class IntelligentPOECraftHelper:
     def generate_detailed_plan(self, base_item: str, target_mods: List[str], 
                              method: str, analysis: Dict, budget: float, ilvl: int) -> str:
         """Generate a detailed, intelligent crafting plan"""
-        plan = f"INTELLIGENT CRAFTING PLAN FOR {base_item.upper()}\n"
-        plan += "="*60 + "\n\n"
+        parts = [f"INTELLIGENT CRAFTING PLAN FOR {base_item.upper()}\n"]
+        parts.append("="*60 + "\n\n")
         
         # Analysis summary
-        plan += "ANALYSIS SUMMARY:\n"
-        plan += f"• Item Level: {ilvl}\n"
-        plan += f"• Target Modifiers: {len(target_mods)}\n"
-        plan += f"• Prefixes: {analysis['prefix_count']}/3\n"
-        plan += f"• Suffixes: {analysis['suffix_count']}/3\n"
-        plan += f"• Total Weight: {analysis['total_weight']}\n"
-        plan += f"• Budget: {budget} Chaos Orbs\n"
-        plan += f"• Selected Method: {method.upper()}\n\n"
+        parts.append("ANALYSIS SUMMARY:\n")
+        parts.append(f"• Item Level: {ilvl}\n")
+        parts.append(f"• Target Modifiers: {len(target_mods)}\n")
+        parts.append(f"• Prefixes: {analysis['prefix_count']}/3\n")
+        parts.append(f"• Suffixes: {analysis['suffix_count']}/3\n")
+        parts.append(f"• Total Weight: {analysis['total_weight']}\n")
+        parts.append(f"• Budget: {budget} Chaos Orbs\n")
+        parts.append(f"• Selected Method: {method.upper()}\n\n")
         
         # Show modifier recognition results
         if 'recognized_modifiers' in analysis and analysis['recognized_modifiers']:
-            plan += "MODIFIER RECOGNITION:\n"
+            parts.append("MODIFIER RECOGNITION:\n")
             for rec in analysis['recognized_modifiers']:
                 if rec['input'] != rec['recognized_as']:
-                    plan += f"• '{rec['input']}' → '{rec['recognized_as']}' ✓\n"
+                    parts.append(f"• '{rec['input']}' → '{rec['recognized_as']}' ✓\n")
                 else:
-                    plan += f"• '{rec['input']}' ✓\n"
-            plan += "\n"
+                    parts.append(f"• '{rec['input']}' ✓\n")
+            parts.append("\n")
         
         if analysis['warnings']:
-            plan += "WARNINGS:\n"
+            parts.append("WARNINGS:\n")
             for warning in analysis['warnings']:
-                plan += f"⚠ {warning}\n"
-            plan += "\n"
+                parts.append(f"⚠ {warning}\n")
+            parts.append("\n")
             
         if not analysis['compatible']:
-            plan += "❌ INCOMPATIBLE MODIFIER COMBINATION!\n"
-            plan += "Please reduce the number of prefixes/suffixes.\n\n"
-            return plan
-            
+            parts.append("❌ INCOMPATIBLE MODIFIER COMBINATION!\n")
+            parts.append("Please reduce the number of prefixes/suffixes.\n\n")
+            return "".join(parts)
+            
+        # Method steps, success probability and alternatives only depend on
+        # these inputs, so regenerating an unchanged plan reuses them. Costs
+        # and budget allocation follow live prices and are always rebuilt
+        key = (method, tuple(target_mods), budget, self._analysis_key(analysis))
+        sections = self._plan_cache.get(key)
+        if sections is None:
+            sections = (self.generate_method_plan(method, target_mods, analysis, budget),
+                        self.calculate_success_probability(method, analysis),
+                        self.suggest_alternatives(target_mods, analysis))
+            if len(self._plan_cache) >= 256:
+                self._plan_cache.clear()
+            self._plan_cache[key] = sections
+        method_plan, success_probability, alternatives = sections
+        
         # Detailed steps based on method
-        if method == "chaos_spam":
-            plan += self.generate_chaos_spam_plan(target_mods, analysis, budget)
-        elif method == "alt_regal":
-            plan += self.generate_alt_regal_plan(target_mods, analysis, budget)
-        elif method == "essence":
-            plan += self.generate_essence_plan(target_mods, analysis, budget)
-        elif method == "fossil":
-            plan += self.generate_fossil_plan(target_mods, analysis, budget)
-        elif method == "mastercraft":
-            plan += self.generate_mastercraft_plan(target_mods, analysis, budget)
+        parts.append(method_plan)
             
         # Cost estimation
-        plan += self.estimate_costs(method, analysis, budget)
+        parts.append(self.estimate_costs(method, analysis, budget))
         
         # Budget optimization
-        plan += self.optimize_budget_allocation(target_mods, budget)
+        parts.append(self.optimize_budget_allocation(target_mods, budget))
         
         # Success probability
-        plan += self.calculate_success_probability(method, analysis)
+        parts.append(success_probability)
         
         # Alternative suggestions
-        plan += self.suggest_alternatives(target_mods, analysis)
+        parts.append(alternatives)
         
-        return plan
+        return "".join(parts)
+    
+    @staticmethod
+    def _analysis_key(analysis: Dict) -> tuple:
+        """Hashable summary of the analysis fields the plan sections read"""
+        return (
+            tuple((mod['name'], mod['weight'], mod['best_tier']['name'], mod['best_tier']['value'])
+                  for mod in analysis['modifiers']),
+            analysis.get('total_weight', 0),
+            analysis.get('min_ilvl'),
+            analysis.get('item_base'),
+            tuple(analysis.get('warnings', ())),
+            tuple((rec['input'], rec['recognized_as'])
+                  for rec in analysis.get('recognized_modifiers', ())),
+        )
+    
+    def generate_method_plan(self, method: str, target_mods: List[str], analysis: Dict, budget: float) -> str:
+        """Generate the step-by-step section for the given crafting method"""
+        if method == "chaos_spam":
+            return self.generate_chaos_spam_plan(target_mods, analysis, budget)
+        elif method == "alt_regal":
+            return self.generate_alt_regal_plan(target_mods, analysis, budget)
+        elif method == "essence":
+            return self.generate_essence_plan(target_mods, analysis, budget)
+        elif method == "fossil":
+            return self.generate_fossil_plan(target_mods, analysis, budget)
+        elif method == "mastercraft":
+            return self.generate_mastercraft_plan(target_mods, analysis, budget)
+        return ""
+        
+    def _render_target_modifiers(self, modifiers: List[Dict]) -> List[str]:
+        """Numbered 'name (tier: value)' lines for the TARGET MODIFIERS section"""
+        lines = []
+        for i, mod in enumerate(modifiers, 1):
+            name, tier = mod['name'], mod['best_tier']
+            lines.append(f"  {i}. {name} ({tier['name']}: {tier['value']})\n")
+        return lines
         
     def generate_chaos_spam_plan(self, target_mods: List[str], analysis: Dict, budget: float) -> str:
         """Generate chaos spam crafting plan"""
-        plan = "CHAOS SPAM METHOD:\n"
-        plan += "-" * 30 + "\n\n"
-        
-        plan += "EXACT STEPS TO FOLLOW:\n"
-        plan += f"1. 🛒 BUY: {int(budget * 0.8)} Chaos Orbs, 5-10 Divine Orbs, 2-3 Annulment Orbs\n"
-        plan += f"2. 🏪 ACQUIRE: {analysis.get('item_base', 'Base item')} with item level {analysis.get('min_ilvl', 85)}+\n"
-        plan += "3. ✅ CHECK: Item must be RARE (yellow) - if not, use Orb of Alchemy\n"
-        plan += "4. 🎲 CRAFT: Right-click Chaos Orb → Left-click your item\n"
-        plan += "5. 👀 INSPECT: Check if you got your target modifiers\n"
-        plan += "6. 🔄 REPEAT: Steps 4-5 until you get desired modifiers\n"
-        plan += "7. 💎 OPTIMIZE: Use Divine Orbs to perfect the numeric values\n"
-        plan += "8. 🗑️ CLEAN: Use Annulment Orbs to remove bad modifiers (RISKY!)\n\n"
-        
-        plan += "TARGET MODIFIERS:\n"
-        for i, mod in enumerate(analysis['modifiers'], 1):
-            tier = mod['best_tier']
-            plan += f"  {i}. {mod['name']} ({tier['name']}: {tier['value']})\n"
-        plan += "\n"
-        
-        plan += "⚠️ IMPORTANT ACTIONS:\n"
-        plan += f"• STOP crafting when you see: {', '.join(target_mods)}\n"
-        plan += f"• BUDGET LIMIT: Stop at {int(budget * 0.9)} Chaos Orbs used\n"
-        plan += "• SAVE OFTEN: Create multiple copies of promising items\n"
-        plan += "• USE FILTER: Highlight items with your target mods\n"
-        plan += f"• EXPECTED ATTEMPTS: ~{max(50, int(budget / 10))} chaos orbs for success\n\n"
-        
-        return plan
+        parts = ["CHAOS SPAM METHOD:\n" + "-" * 30 + "\n\n"]
+        
+        parts.append("EXACT STEPS TO FOLLOW:\n")
+        parts.append(f"1. 🛒 BUY: {int(budget * 0.8)} Chaos Orbs, 5-10 Divine Orbs, 2-3 Annulment Orbs\n")
+        parts.append(f"2. 🏪 ACQUIRE: {analysis.get('item_base', 'Base item')} with item level {analysis.get('min_ilvl', 85)}+\n")
+        parts.append("3. ✅ CHECK: Item must be RARE (yellow) - if not, use Orb of Alchemy\n")
+        parts.append("4. 🎲 CRAFT: Right-click Chaos Orb → Left-click your item\n")
+        parts.append("5. 👀 INSPECT: Check if you got your target modifiers\n")
+        parts.append("6. 🔄 REPEAT: Steps 4-5 until you get desired modifiers\n")
+        parts.append("7. 💎 OPTIMIZE: Use Divine Orbs to perfect the numeric values\n")
+        parts.append("8. 🗑️ CLEAN: Use Annulment Orbs to remove bad modifiers (RISKY!)\n\n")
+        
+        parts.append("TARGET MODIFIERS:\n")
+        parts.extend(analysis['rendered_mods'])
+        parts.append("\n")
+        
+        parts.append("⚠️ IMPORTANT ACTIONS:\n")
+        parts.append(f"• STOP crafting when you see: {', '.join(target_mods)}\n")
+        parts.append(f"• BUDGET LIMIT: Stop at {int(budget * 0.9)} Chaos Orbs used\n")
+        parts.append("• SAVE OFTEN: Create multiple copies of promising items\n")
+        parts.append("• USE FILTER: Highlight items with your target mods\n")
+        parts.append(f"• EXPECTED ATTEMPTS: ~{max(50, int(budget / 10))} chaos orbs for success\n\n")
+        
+        return "".join(parts)
         
     def generate_alt_regal_plan(self, target_mods: List[str], analysis: Dict, budget: float) -> str:
         """Generate alt+regal crafting plan"""
-        plan = "ALTERATION + REGAL METHOD:\n"
-        plan += "-" * 30 + "\n\n"
-        plan += f"Budget: {budget:.0f}c | Target: {len(target_mods)} modifiers\n\n"
-        
-        plan += "EXACT STEPS TO FOLLOW:\n"
-        plan += f"1. 🛒 BUY: {int(budget * 0.4)} Alteration Orbs, {int(budget * 0.1)} Augmentation Orbs, 5 Regal Orbs, 2-3 Exalted Orbs\n"
-        plan += f"2. 🏪 ACQUIRE: WHITE (normal) {analysis.get('item_base', 'base item')} with ilvl {analysis.get('min_ilvl', 85)}+\n"
-        plan += "3. ✅ USE: Right-click Orb of Transmutation → Left-click item (makes it BLUE/magic)\n"
-        plan += "4. 🎲 SPAM: Right-click Alteration Orb → Left-click item until you see ONE target mod\n"
-        plan += "5. 🔍 CHECK: If item has only 1 mod, use Augmentation Orb to add 2nd mod\n"
-        plan += "6. ⬆️ UPGRADE: Right-click Regal Orb → Left-click item (makes it YELLOW/rare)\n"
-        plan += "7. ✨ FINISH: Use Exalted Orbs to add remaining target modifiers\n"
-        plan += "7. Use Divine Orbs to perfect values\n\n"
-        
-        plan += "TARGET MODIFIERS:\n"
-        for i, mod in enumerate(analysis['modifiers'], 1):
-            tier = mod['best_tier']
-            plan += f"  {i}. {mod['name']} ({tier['name']}: {tier['value']})\n"
-        plan += "\n"
-        
-        plan += "TIPS:\n"
-        plan += "• Use Eternal Orb imprint before regaling if available\n"
-        plan += "• Focus on highest weight modifiers first\n"
-        plan += "• Consider using Beastcrafting for imprinting\n"
-        plan += "⚠️ COMPLETION CHECKLIST:\n"
-        plan += f"• ✅ Got target prefix mods: {', '.join([m for m in target_mods if 'life' in m.lower() or 'damage' in m.lower()][:2])}\n"
-        plan += f"• ✅ Got target suffix mods: {', '.join([m for m in target_mods if 'resist' in m.lower() or 'speed' in m.lower()][:2])}\n"
-        plan += f"• ✅ Budget remaining: Track your spending vs {budget}c limit\n\n"
-        
-        return plan
+        parts = ["ALTERATION + REGAL METHOD:\n" + "-" * 30 + "\n\n"]
+        parts.append(f"Budget: {budget:.0f}c | Target: {len(target_mods)} modifiers\n\n")
+        
+        parts.append("EXACT STEPS TO FOLLOW:\n")
+        parts.append(f"1. 🛒 BUY: {int(budget * 0.4)} Alteration Orbs, {int(budget * 0.1)} Augmentation Orbs, 5 Regal Orbs, 2-3 Exalted Orbs\n")
+        parts.append(f"2. 🏪 ACQUIRE: WHITE (normal) {analysis.get('item_base', 'base item')} with ilvl {analysis.get('min_ilvl', 85)}+\n")
+        parts.append("3. ✅ USE: Right-click Orb of Transmutation → Left-click item (makes it BLUE/magic)\n")
+        parts.append("4. 🎲 SPAM: Right-click Alteration Orb → Left-click item until you see ONE target mod\n")
+        parts.append("5. 🔍 CHECK: If item has only 1 mod, use Augmentation Orb to add 2nd mod\n")
+        parts.append("6. ⬆️ UPGRADE: Right-click Regal Orb → Left-click item (makes it YELLOW/rare)\n")
+        parts.append("7. ✨ FINISH: Use Exalted Orbs to add remaining target modifiers\n")
+        parts.append("7. Use Divine Orbs to perfect values\n\n")
+        
+        parts.append("TARGET MODIFIERS:\n")
+        parts.extend(analysis['rendered_mods'])
+        parts.append("\n")
+        
+        parts.append("TIPS:\n")
+        parts.append("• Use Eternal Orb imprint before regaling if available\n")
+        parts.append("• Focus on highest weight modifiers first\n")
+        parts.append("• Consider using Beastcrafting for imprinting\n")
+        parts.append("⚠️ COMPLETION CHECKLIST:\n")
+        parts.append(f"• ✅ Got target prefix mods: {', '.join([m for m in target_mods if 'life' in m.lower() or 'damage' in m.lower()][:2])}\n")
+        parts.append(f"• ✅ Got target suffix mods: {', '.join([m for m in target_mods if 'resist' in m.lower() or 'speed' in m.lower()][:2])}\n")
+        parts.append(f"• ✅ Budget remaining: Track your spending vs {budget}c limit\n\n")
+        
+        return "".join(parts)
         
     def generate_essence_plan(self, target_mods: List[str], analysis: Dict, budget: float) -> str:
         """Generate detailed essence crafting plan with automatic essence detection"""
-        plan = "ESSENCE CRAFTING METHOD:\n"
-        plan += "-" * 30 + "\n\n"
-        plan += f"Budget: {budget:.0f}c | Complexity: {analysis.get('total_weight', 0)}\n\n"
+        parts = ["ESSENCE CRAFTING METHOD:\n" + "-" * 30 + "\n\n"]
+        parts.append(f"Budget: {budget:.0f}c | Complexity: {analysis.get('total_weight', 0)}\n\n")
         
         # Auto-detect required essences
-        essence_req = self.detect_required_essences(target_mods)
+        # Reuse the names analyze_modifiers already recognized
+        recognized = analysis.get('recognized_modifiers')
+        normalized_mods = [rec['recognized_as'] for rec in recognized] if recognized else None
+        essence_req = self.detect_required_essences(target_mods, normalized_mods)
         
         if essence_req['guaranteed_mods']:
-            plan += "🔍 AUTO-DETECTED ESSENCE REQUIREMENTS:\n"
+            parts.append("🔍 AUTO-DETECTED ESSENCE REQUIREMENTS:\n")
             for priority_mod in essence_req['essence_priorities']:
-                plan += f"• {priority_mod['modifier']} → {priority_mod['essence']} ({priority_mod['type']})\n"
-            plan += "\n"
+                parts.append(f"• {priority_mod['modifier']} → {priority_mod['essence']} ({priority_mod['type']})\n")
+            parts.append("\n")
             
-            plan += "📋 DETAILED STEP-BY-STEP PROCESS:\n"
-            plan += "=" * 40 + "\n\n"
+            parts.append("📋 DETAILED STEP-BY-STEP PROCESS:\n")
+            parts.append("=" * 40 + "\n\n")
             
             # Step 1: Identify essences
-            plan += "STEP 1: ESSENCE IDENTIFICATION ✅\n"
-            plan += f"Required Essences: {', '.join(essence_req['required_essences'])}\n"
-            plan += f"Primary Essence: {essence_req['essence_priorities'][0]['essence']}\n"
-            plan += f"Guarantees: {essence_req['essence_priorities'][0]['modifier']}\n\n"
+            parts.append("STEP 1: ESSENCE IDENTIFICATION ✅\n")
+            parts.append(f"Required Essences: {', '.join(essence_req['required_essences'])}\n")
+            parts.append(f"Primary Essence: {essence_req['essence_priorities'][0]['essence']}\n")
+            parts.append(f"Guarantees: {essence_req['essence_priorities'][0]['modifier']}\n\n")
             
             # Step 2: Use essence on base
-            plan += "STEP 2: APPLY PRIMARY ESSENCE 🎯\n"
-            plan += f"🛒 BUY: {essence_req['essence_priorities'][0]['essence']} (quantity: {max(10, int(budget/20))})\n"
-            plan += f"🏪 ACQUIRE: WHITE {analysis.get('item_base', 'base item')} with ilvl {analysis.get('min_ilvl', 85)}+\n"
-            plan += f"✅ ACTION: Right-click {essence_req['essence_priorities'][0]['essence']} → Left-click item\n"
-            plan += f"👀 RESULT: Item becomes RARE with guaranteed {essence_req['essence_priorities'][0]['modifier']}\n\n"
+            parts.append("STEP 2: APPLY PRIMARY ESSENCE 🎯\n")
+            parts.append(f"🛒 BUY: {essence_req['essence_priorities'][0]['essence']} (quantity: {max(10, int(budget/20))})\n")
+            parts.append(f"🏪 ACQUIRE: WHITE {analysis.get('item_base', 'base item')} with ilvl {analysis.get('min_ilvl', 85)}+\n")
+            parts.append(f"✅ ACTION: Right-click {essence_req['essence_priorities'][0]['essence']} → Left-click item\n")
+            parts.append(f"👀 RESULT: Item becomes RARE with guaranteed {essence_req['essence_priorities'][0]['modifier']}\n\n")
             primary_essence = essence_req['essence_priorities'][0]['essence']
             primary_mod = essence_req['essence_priorities'][0]['modifier']
-            plan += f"1. Obtain base item (normal rarity)\n"
-            plan += f"2. Use {primary_essence} on base item\n"
-            plan += f"3. This GUARANTEES {primary_mod} modifier\n"
-            plan += f"4. Check other rolled modifiers\n\n"
+            parts.append(f"1. Obtain base item (normal rarity)\n")
+            parts.append(f"2. Use {primary_essence} on base item\n")
+            parts.append(f"3. This GUARANTEES {primary_mod} modifier\n")
+            parts.append(f"4. Check other rolled modifiers\n\n")
             
             # Step 3: Evaluation
-            plan += "STEP 3: EVALUATE RESULTS 🔍\n"
-            plan += "If satisfied with all modifiers:\n"
-            plan += "  → Proceed to Step 5 (Divine Orbs)\n"
-            plan += "If you need more modifiers:\n"
-            plan += "  → Proceed to Step 4 (Exalted Orbs)\n"
-            plan += "If completely unsatisfied:\n"
-            plan += "  → Use Chaos Orbs or restart with essence\n\n"
+            parts.append("STEP 3: EVALUATE RESULTS 🔍\n")
+            parts.append("If satisfied with all modifiers:\n")
+            parts.append("  → Proceed to Step 5 (Divine Orbs)\n")
+            parts.append("If you need more modifiers:\n")
+            parts.append("  → Proceed to Step 4 (Exalted Orbs)\n")
+            parts.append("If completely unsatisfied:\n")
+            parts.append("  → Use Chaos Orbs or restart with essence\n\n")
             
             # Step 4: Add more modifiers
-            plan += "STEP 4: ADD MORE MODIFIERS 💎\n"
+            parts.append("STEP 4: ADD MORE MODIFIERS 💎\n")
             if len(essence_req['essence_priorities']) > 1:
-                plan += f"Option A: Use additional essences:\n"
+                parts.append(f"Option A: Use additional essences:\n")
                 for i, mod in enumerate(essence_req['essence_priorities'][1:], 2):
-                    plan += f"  {i}. {mod['essence']} for {mod['modifier']}\n"
-                plan += "Option B: Use Exalted Orbs (random modifiers)\n"
+                    parts.append(f"  {i}. {mod['essence']} for {mod['modifier']}\n")
+                parts.append("Option B: Use Exalted Orbs (random modifiers)\n")
             else:
-                plan += "Use Exalted Orbs to add random modifiers\n"
+                parts.append("Use Exalted Orbs to add random modifiers\n")
             
             if essence_req['non_essence_mods']:
-                plan += f"Note: These modifiers cannot be guaranteed with essences:\n"
+                parts.append(f"Note: These modifiers cannot be guaranteed with essences:\n")
                 for mod in essence_req['non_essence_mods']:
-                    plan += f"  • {mod} (requires Exalted Orbs or luck)\n"
-            plan += "\n"
+                    parts.append(f"  • {mod} (requires Exalted Orbs or luck)\n")
+            parts.append("\n")
             
             # Step 5: Perfect values
-            plan += "STEP 5: PERFECT VALUES ✨\n"
-            plan += "1. Use Divine Orbs to reroll modifier values\n"
-            plan += "2. Target tier 1-2 values for best results\n"
-            plan += "3. Divine Orbs are expensive - use sparingly\n\n"
+            parts.append("STEP 5: PERFECT VALUES ✨\n")
+            parts.append("1. Use Divine Orbs to reroll modifier values\n")
+            parts.append("2. Target tier 1-2 values for best results\n")
+            parts.append("3. Divine Orbs are expensive - use sparingly\n\n")
             
         else:
-            plan += "⚠️ NO ESSENCE-GUARANTEED MODIFIERS FOUND\n"
-            plan += "None of your target modifiers can be guaranteed with essences.\n"
-            plan += "Consider alternative crafting methods like:\n"
-            plan += "• Chaos Spam\n"
-            plan += "• Alt-Regal\n"
-            plan += "• Fossil Crafting\n\n"
+            parts.append("⚠️ NO ESSENCE-GUARANTEED MODIFIERS FOUND\n")
+            parts.append("None of your target modifiers can be guaranteed with essences.\n")
+            parts.append("Consider alternative crafting methods like:\n")
+            parts.append("• Chaos Spam\n")
+            parts.append("• Alt-Regal\n")
+            parts.append("• Fossil Crafting\n\n")
         
         # Cost estimation
-        plan += "💰 ESSENCE CRAFTING COSTS:\n"
-        plan += f"Budget: {budget} Chaos Orbs\n"
+        parts.append("💰 ESSENCE CRAFTING COSTS:\n")
+        parts.append(f"Budget: {budget} Chaos Orbs\n")
         if essence_req['required_essences']:
-            plan += "Estimated essence costs:\n"
+            parts.append("Estimated essence costs:\n")
             for essence in essence_req['required_essences']:
-                plan += f"• {essence}: 5-15 Chaos each\n"
-        plan += "• Exalted Orbs: 150-200 Chaos each\n"
-        plan += "• Divine Orbs: 200-250 Chaos each\n\n"
+                parts.append(f"• {essence}: 5-15 Chaos each\n")
+        parts.append("• Exalted Orbs: 150-200 Chaos each\n")
+        parts.append("• Divine Orbs: 200-250 Chaos each\n\n")
         
-        plan += "💡 ESSENCE CRAFTING TIPS:\n"
-        plan += "• Always start with white (normal) base items\n"
-        plan += "• Essences can be used on magic items (removes existing mods)\n"
-        plan += "• Higher tier essences give better modifier ranges\n"
-        plan += "• Plan your prefix/suffix allocation carefully\n"
-        plan += "• Consider essence prices vs. expected attempts\n\n"
+        parts.append("💡 ESSENCE CRAFTING TIPS:\n")
+        parts.append("• Always start with white (normal) base items\n")
+        parts.append("• Essences can be used on magic items (removes existing mods)\n")
+        parts.append("• Higher tier essences give better modifier ranges\n")
+        parts.append("• Plan your prefix/suffix allocation carefully\n")
+        parts.append("• Consider essence prices vs. expected attempts\n\n")
         
-        return plan
+        return "".join(parts)
         
     def generate_fossil_plan(self, target_mods: List[str], analysis: Dict, budget: float) -> str:
         """Generate fossil crafting plan"""
-        plan = "FOSSIL CRAFTING METHOD:\n"
-        plan += "-" * 30 + "\n\n"
-        plan += f"Budget: {budget:.0f}c | Modifiers: {len(target_mods)}\n\n"
-        
-        plan += "STEP-BY-STEP PROCESS:\n"
-        plan += "1. Obtain relevant fossils for your modifiers\n"
-        plan += "2. Use Resonators to apply fossils to base item\n"
-        plan += "3. Fossils bias the outcome toward certain modifiers\n"
-        plan += "4. Repeat until satisfied with results\n"
-        plan += "5. Use Divine Orbs to perfect values\n\n"
-        
-        plan += "FOSSIL RECOMMENDATIONS:\n"
+        parts = ["FOSSIL CRAFTING METHOD:\n" + "-" * 30 + "\n\n"]
+        parts.append(f"Budget: {budget:.0f}c | Modifiers: {len(target_mods)}\n\n")
+        
+        parts.append(self.FOSSIL_STEPS)
+        
+        parts.append("FOSSIL RECOMMENDATIONS:\n")
+        database = self.modifier_database
         for mod in analysis['modifiers']:
-            if mod['name'] in self.modifier_database:
-                fossils = self.modifier_database[mod['name']].get('fossils', ['Unknown'])
-                plan += f"• {mod['name']}: {', '.join(fossils)}\n"
-        plan += "\n"
+            mod_name = mod['name']
+            mod_data = database.get(mod_name)
+            if mod_data is not None:
+                parts.append(f"• {mod_name}: {mod_data['_fossils_text']}\n")
+        parts.append("\n")
         
-        plan += "TIPS:\n"
-        plan += "• Fossils increase/decrease chances of modifier types\n"
-        plan += "• Combine multiple fossils for better targeting\n"
-        plan += "• More expensive but more controlled than chaos spam\n"
-        plan += "• Check fossil prices and availability\n\n"
+        parts.append(self.FOSSIL_TIPS)
         
-        return plan
+        return "".join(parts)
         
     def open_flask_crafting(self):
         """Open the dedicated flask crafting interface"""
         try:
             import subprocess
-            import sys
             
             # Launch the flask crafting helper as a separate process
             subprocess.Popen([sys.executable, "flask_craft_helper.py"], 
@@ -941,193 +1157,199 @@ class IntelligentPOECraftHelper:
         
     def generate_mastercraft_plan(self, target_mods: List[str], analysis: Dict, budget: float) -> str:
         """Generate mastercraft plan"""
-        plan = "MASTERCRAFT METHOD:\n"
-        plan += "-" * 30 + "\n\n"
-        plan += f"Budget: {budget:.0f}c | Target mods: {len(target_mods)}\n\n"
-        
-        plan += "STEP-BY-STEP PROCESS:\n"
-        plan += "1. Craft base item using other methods first\n"
-        plan += "2. Use Crafting Bench to add guaranteed modifiers\n"
-        plan += "3. Mastercrafted mods can be changed at any time\n"
-        plan += "4. Consider this for final modifier slots\n\n"
-        
-        plan += "TARGET MODIFIERS:\n"
-        for i, mod in enumerate(analysis['modifiers'], 1):
-            tier = mod['best_tier']
-            plan += f"  {i}. {mod['name']} ({tier['name']}: {tier['value']})\n"
-        plan += "\n"
-        
-        plan += "TIPS:\n"
-        plan += "• Only use for modifiers available on crafting bench\n"
-        plan += "• Leaves item with 'Crafted' modifier\n"
-        plan += "• Can be removed with Orb of Scouring\n"
-        plan += "• Great for finishing touches\n\n"
+        parts = ["MASTERCRAFT METHOD:\n" + "-" * 30 + "\n\n"]
+        parts.append(f"Budget: {budget:.0f}c | Target mods: {len(target_mods)}\n\n")
+        
+        parts.append(self.MASTERCRAFT_STEPS)
+        
+        parts.append("TARGET MODIFIERS:\n")
+        parts.extend(analysis['rendered_mods'])
+        parts.append("\n")
+        
+        parts.append(self.MASTERCRAFT_TIPS)
+        
+        return "".join(parts)
+        
+    def _chaos_spam_costs(self, analysis: Dict, current_prices: Dict) -> Tuple[float, List[str]]:
+        """Chaos spam cost total and breakdown lines"""
+        base_attempts = 200 + (analysis['total_weight'] * 0.5)
+        chaos_cost = base_attempts * current_prices.get('Chaos Orb', 1.0)
+        mod_count = analysis['mod_count']
+        divine_price = current_prices.get('Divine Orb', 15.0)
+        divine_count = self.DIVINES_BY_MOD_COUNT[mod_count] if mod_count <= 6 else mod_count // 2
+        divine_cost = divine_count * divine_price
+        annul_price = current_prices.get('Orb of Annulment', 8.0)
+        annul_count = mod_count
+        annul_cost = annul_count * annul_price
+        
+        return chaos_cost + divine_cost + annul_cost, [
+            f"• Chaos Orbs needed: {base_attempts:.0f} = {chaos_cost:.1f}c\n",
+            f"• Divine Orbs: {divine_count} × {divine_price:.1f}c = {divine_cost:.1f}c\n",
+            f"• Annulment Orbs: {annul_count} × {annul_price:.1f}c = {annul_cost:.1f}c\n",
+        ]
         
-        return plan
+    def _alt_regal_costs(self, analysis: Dict, current_prices: Dict) -> Tuple[float, List[str]]:
+        """Alt+regal cost total and breakdown lines"""
+        alt_attempts = 50 + (analysis['total_weight'] * 0.2)
+        alt_price = current_prices.get('Orb of Alteration', 0.1)
+        alt_cost = alt_attempts * alt_price
+        regal_price = current_prices.get('Regal Orb', 2.0)
+        regal_count = analysis['mod_count']
+        regal_cost = regal_count * regal_price
+        ex_price = current_prices.get('Exalted Orb', 200.0)
+        ex_count = self.EXALTS_BY_MOD_COUNT[regal_count] if regal_count <= 6 else regal_count - 1
+        ex_cost = ex_count * ex_price
+        
+        return alt_cost + regal_cost + ex_cost, [
+            f"• Alteration Orbs: {alt_attempts:.0f} × {alt_price:.3f}c = {alt_cost:.1f}c\n",
+            f"• Regal Orbs: {regal_count} × {regal_price:.1f}c = {regal_cost:.1f}c\n",
+            f"• Exalted Orbs: {ex_count} × {ex_price:.1f}c = {ex_cost:.1f}c\n",
+        ]
+        
+    def _essence_costs(self, analysis: Dict, current_prices: Dict) -> Tuple[float, List[str]]:
+        """Essence cost total and breakdown lines"""
+        essence_price = current_prices.get('Essence', 5.0)
+        chaos_price = current_prices.get('Chaos Orb', 1.0)
+        annul_price = current_prices.get('Orb of Annulment', 8.0)
+        essence_count = analysis['mod_count']
+        essence_cost = essence_count * essence_price
+        chaos_cost = 100 * chaos_price
+        annul_cost = essence_count * annul_price
+        
+        return essence_cost + chaos_cost + annul_cost, [
+            f"• Essences: {essence_count} × {essence_price:.1f}c = {essence_cost:.1f}c\n",
+            f"• Chaos Orbs: 100 × {chaos_price:.1f}c = {chaos_cost:.1f}c\n",
+            f"• Annulment Orbs: {essence_count} × {annul_price:.1f}c = {annul_cost:.1f}c\n",
+        ]
+        
+    def _fossil_costs(self, analysis: Dict, current_prices: Dict) -> Tuple[float, List[str]]:
+        """Fossil cost total and breakdown lines"""
+        fossil_price = current_prices.get('Fossil', 3.0)
+        resonator_price = current_prices.get('Resonator', 2.0)
+        chaos_price = current_prices.get('Chaos Orb', 1.0)
+        fossil_count = analysis['mod_count']
+        fossil_cost = fossil_count * fossil_price
+        resonator_cost = fossil_count * resonator_price
+        chaos_cost = 50 * chaos_price
+        
+        return fossil_cost + resonator_cost + chaos_cost, [
+            f"• Fossils: {fossil_count} × {fossil_price:.1f}c = {fossil_cost:.1f}c\n",
+            f"• Resonators: {fossil_count} × {resonator_price:.1f}c = {resonator_cost:.1f}c\n",
+            f"• Chaos Orbs: 50 × {chaos_price:.1f}c = {chaos_cost:.1f}c\n",
+        ]
+        
+    def _base_costs(self, analysis: Dict, current_prices: Dict) -> Tuple[float, List[str]]:
+        """Flat cost for methods without their own breakdown"""
+        total_chaos_cost = 100
+        return total_chaos_cost, [f"• Base crafting costs: {total_chaos_cost:.1f}c\n"]
+        
+    # Cost breakdown per crafting method; other methods use _base_costs
+    COST_ESTIMATORS = {
+        'chaos_spam': _chaos_spam_costs,
+        'alt_regal': _alt_regal_costs,
+        'essence': _essence_costs,
+        'fossil': _fossil_costs,
+    }
         
     def estimate_costs(self, method: str, analysis: Dict, budget: float) -> str:
         """Estimate crafting costs using real-time market prices"""
-        plan = "COST ESTIMATION (Live Market Prices):\n"
-        plan += "-" * 40 + "\n"
+        parts = ["COST ESTIMATION (Live Market Prices):\n" + "-" * 40 + "\n"]
         
         # Get current market prices
         current_prices = self.currency_costs
-        total_chaos_cost = 0
-        
-        if method == "chaos_spam":
-            base_attempts = 200 + (analysis['total_weight'] * 0.5)
-            chaos_cost = base_attempts * current_prices.get('Chaos Orb', 1.0)
-            divine_count = max(1, len(analysis['modifiers']) // 2)
-            divine_cost = divine_count * current_prices.get('Divine Orb', 15.0)
-            annul_count = len(analysis['modifiers'])
-            annul_cost = annul_count * current_prices.get('Orb of Annulment', 8.0)
-            
-            total_chaos_cost = chaos_cost + divine_cost + annul_cost
-            
-            plan += f"• Chaos Orbs needed: {base_attempts:.0f} = {chaos_cost:.1f}c\n"
-            plan += f"• Divine Orbs: {divine_count} × {current_prices.get('Divine Orb', 15.0):.1f}c = {divine_cost:.1f}c\n"
-            plan += f"• Annulment Orbs: {annul_count} × {current_prices.get('Orb of Annulment', 8.0):.1f}c = {annul_cost:.1f}c\n"
-            
-        elif method == "alt_regal":
-            alt_attempts = 50 + (analysis['total_weight'] * 0.2)
-            alt_cost = alt_attempts * current_prices.get('Orb of Alteration', 0.1)
-            regal_count = len(analysis['modifiers'])
-            regal_cost = regal_count * current_prices.get('Regal Orb', 2.0)
-            ex_count = max(0, len(analysis['modifiers']) - 1)
-            ex_cost = ex_count * current_prices.get('Exalted Orb', 200.0)
-            
-            total_chaos_cost = alt_cost + regal_cost + ex_cost
-            
-            plan += f"• Alteration Orbs: {alt_attempts:.0f} × {current_prices.get('Orb of Alteration', 0.1):.3f}c = {alt_cost:.1f}c\n"
-            plan += f"• Regal Orbs: {regal_count} × {current_prices.get('Regal Orb', 2.0):.1f}c = {regal_cost:.1f}c\n"
-            plan += f"• Exalted Orbs: {ex_count} × {current_prices.get('Exalted Orb', 200.0):.1f}c = {ex_cost:.1f}c\n"
-            
-        elif method == "essence":
-            essence_count = len(analysis['modifiers'])
-            essence_cost = essence_count * current_prices.get('Essence', 5.0)
-            chaos_cost = 100 * current_prices.get('Chaos Orb', 1.0)
-            annul_cost = essence_count * current_prices.get('Orb of Annulment', 8.0)
-            
-            total_chaos_cost = essence_cost + chaos_cost + annul_cost
-            
-            plan += f"• Essences: {essence_count} × {current_prices.get('Essence', 5.0):.1f}c = {essence_cost:.1f}c\n"
-            plan += f"• Chaos Orbs: 100 × {current_prices.get('Chaos Orb', 1.0):.1f}c = {chaos_cost:.1f}c\n"
-            plan += f"• Annulment Orbs: {essence_count} × {current_prices.get('Orb of Annulment', 8.0):.1f}c = {annul_cost:.1f}c\n"
-            
-        elif method == "fossil":
-            fossil_count = len(analysis['modifiers'])
-            fossil_cost = fossil_count * current_prices.get('Fossil', 3.0)
-            resonator_cost = fossil_count * current_prices.get('Resonator', 2.0)
-            chaos_cost = 50 * current_prices.get('Chaos Orb', 1.0)
+        estimator = self.COST_ESTIMATORS.get(method, IntelligentPOECraftHelper._base_costs)
+        total_chaos_cost, cost_lines = estimator(self, analysis, current_prices)
+        parts.extend(cost_lines)
             
-            total_chaos_cost = fossil_cost + resonator_cost + chaos_cost
-            
-            plan += f"• Fossils: {fossil_count} × {current_prices.get('Fossil', 3.0):.1f}c = {fossil_cost:.1f}c\n"
-            plan += f"• Resonators: {fossil_count} × {current_prices.get('Resonator', 2.0):.1f}c = {resonator_cost:.1f}c\n"
-            plan += f"• Chaos Orbs: 50 × {current_prices.get('Chaos Orb', 1.0):.1f}c = {chaos_cost:.1f}c\n"
-            
-        else:
-            total_chaos_cost = 100
-            plan += f"• Base crafting costs: {total_chaos_cost:.1f}c\n"
-            
-        plan += f"\n💰 TOTAL ESTIMATED COST: {total_chaos_cost:.1f} chaos orbs\n"
+        total_str = f"{total_chaos_cost:.1f}"
+        parts.append(f"\n💰 TOTAL ESTIMATED COST: {total_str} chaos orbs\n")
         
         # Budget analysis with cost efficiency
         if total_chaos_cost > budget:
             over_budget = total_chaos_cost - budget
-            plan += f"⚠ WARNING: Cost ({total_chaos_cost:.1f}c) exceeds budget ({budget}c) by {over_budget:.1f}c\n"
+            parts.append(f"⚠ WARNING: Cost ({total_str}c) exceeds budget ({budget}c) by {over_budget:.1f}c\n")
         else:
-            plan += f"✅ Budget sufficient for this method\n"
+            parts.append(f"✅ Budget sufficient for this method\n")
             
-        plan += "\n"
-        return plan
+        parts.append("\n")
+        return "".join(parts)
         
     def calculate_success_probability(self, method: str, analysis: Dict) -> str:
         """Calculate success probability"""
-        plan = "SUCCESS PROBABILITY:\n"
-        plan += "-" * 20 + "\n"
+        parts = ["SUCCESS PROBABILITY:\n" + "-" * 20 + "\n"]
         
         total_weight = analysis.get('total_weight', 0)
-        mod_count = len(analysis.get('modifiers', []))
+        mod_count = analysis.get('mod_count', 0)
         
         if method == "chaos_spam":
             # Rough probability calculation
-            base_prob = 1.0
-            for mod in analysis.get('modifiers', []):
-                prob = mod.get('weight', 1000) / 10000  # Rough estimate
-                base_prob *= prob
-            success_rate = base_prob * 100
-            plan += f"• Getting all {mod_count} modifiers: {success_rate:.4f}%\n"
-            plan += f"• Total modifier weight: {total_weight}\n"
-            plan += f"• Expected attempts: {1/max(success_rate/100, 0.0001):.0f} chaos orbs\n"
+            log_prob = log_success_probability(analysis.get('weights_tuple', ()))
+            success_rate = math.exp(log_prob) * 100
+            expected_attempts = math.exp(-max(log_prob, LOG_MIN_SUCCESS_PROBABILITY))
+            parts.append(f"• Getting all {mod_count} modifiers: {success_rate:.4f}%\n")
+            parts.append(f"• Total modifier weight: {total_weight}\n")
+            parts.append(f"• Expected attempts: {expected_attempts:.0f} chaos orbs\n")
             
         elif method == "alt_regal":
             success_rate = 50.0  # Rough estimate for alt+regal
-            plan += f"• Success rate per attempt: {success_rate}%\n"
-            plan += f"• Expected attempts: {2} (1 alt, 1 regal)\n"
+            parts.append(f"• Success rate per attempt: {success_rate}%\n")
+            parts.append(f"• Expected attempts: {2} (1 alt, 1 regal)\n")
             
         elif method == "essence":
             success_rate = 80.0  # Essence guarantees one mod
-            plan += f"• Guaranteed modifier success: {success_rate}%\n"
-            plan += f"• Additional mods: RNG dependent\n"
+            parts.append(f"• Guaranteed modifier success: {success_rate}%\n")
+            parts.append(f"• Additional mods: RNG dependent\n")
             
         else:
             success_rate = 30.0
-            plan += f"• Estimated success rate: {success_rate}%\n"
+            parts.append(f"• Estimated success rate: {success_rate}%\n")
             
-        plan += "\n"
-        return plan
+        parts.append("\n")
+        return "".join(parts)
         
     def suggest_alternatives(self, target_mods: List[str], analysis: Dict) -> str:
         """Suggest alternative modifiers"""
-        plan = "ALTERNATIVE SUGGESTIONS:\n"
-        plan += "-" * 25 + "\n"
+        parts = ["ALTERNATIVE SUGGESTIONS:\n" + "-" * 25 + "\n"]
         
         if analysis.get('warnings'):
-            plan += "⚠️ DETECTED ISSUES:\n"
+            parts.append("⚠️ DETECTED ISSUES:\n")
             for warning in analysis['warnings'][:3]:
-                plan += f"• {warning}\n"
-            plan += "\n"
+                parts.append(f"• {warning}\n")
+            parts.append("\n")
         
         for mod_name in target_mods:
             if mod_name in self.modifier_database:
-                mod_data = self.modifier_database[mod_name]
-                mod_type = mod_data['type']
+                mod_type = self.modifier_database[mod_name]['type']
                 
                 # Find similar modifiers
-                alternatives = []
-                for other_mod, other_data in self.modifier_database.items():
-                    if other_mod != mod_name and other_data['type'] == mod_type:
-                        alternatives.append(other_mod)
+                alternatives = [other_mod for other_mod in self._mods_by_type[mod_type]
+                                if other_mod != mod_name]
                         
                 if alternatives:
-                    plan += f"• Instead of '{mod_name}', consider:\n"
+                    parts.append(f"• Instead of '{mod_name}', consider:\n")
                     for alt in alternatives[:3]:  # Top 3 alternatives
-                        plan += f"  - {alt}\n"
-                    plan += "\n"
+                        parts.append(f"  - {alt}\n")
+                    parts.append("\n")
                     
-        plan += "GENERAL TIPS:\n"
-        plan += "• Always check item level requirements\n"
-        plan += "• Consider using Orb of Scouring to start over\n"
-        plan += "• Divine Orbs reroll numeric values\n"
-        plan += "• Annulment Orbs can remove unwanted modifiers\n"
-        plan += "• Use PoE wiki/craft of exile for detailed info\n"
-        plan += "• Consider influenced items for special modifiers\n"
+        parts.append(self.GENERAL_TIPS)
         
-        return plan
+        return "".join(parts)
         
     def clear_all(self):
+        self._plan_cache.clear()
         self.base_entry.delete(0, tk.END)
         self.target_text.delete("1.0", tk.END)
         self.results_text.delete("1.0", tk.END)
-        self.budget_entry.delete(0, tk.END)
-        self.budget_entry.insert(0, "1000")
-        self.ilvl_entry.delete(0, tk.END)
-        self.ilvl_entry.insert(0, "85")
+        # Tk already redraws once at idle; just skip resetting entries that
+        # still hold their defaults
+        for entry, default in ((self.budget_entry, "1000"), (self.ilvl_entry, "85")):
+            if entry.get() != default:
+                entry.delete(0, tk.END)
+                entry.insert(0, default)
         
     def toggle_overlay(self):
-        current = self.root.attributes('-topmost')
-        self.root.attributes('-topmost', not current)
+        self._topmost = not self._topmost
+        self.root.attributes('-topmost', self._topmost)
     
     def refresh_prices(self):
         """Manually refresh market prices"""
@@ -1898,10 +2120,17 @@ RING:
         except Exception as e:
             return f"\n\n⚠️ Error generating recommendations: {e}\n"
     
+    def show(self):
+        """Build the UI if needed and enter the Tk main loop"""
+        if not self._ui_built:
+            self.setup_ui()
+            self._ui_built = True
+        self.root.mainloop()
+    
     def run(self):
         # Set up cleanup on window close
         self.root.protocol("WM_DELETE_WINDOW", lambda: [self.cleanup_on_exit(), self.root.destroy()])
-        self.root.mainloop()
+        self.show()
 
 if __name__ == "__main__":
     app = IntelligentPOECraftHelper()
@@ -3,6 +3,7 @@ from tkinter import ttk, scrolledtext, messagebox
 import json
 import os
 import random
+import re
 import threading
 import time
 from typing import List, Dict, Tuple, Optional
@@ -175,8 +176,6 @@ class SimplePOECraftHelper:
     
     def normalize_modifier_name(self, input_modifier: str) -> str:
         """Enhanced modifier name recognition with fuzzy matching"""
-        import re
-        
         input_lower = input_modifier.lower().strip()
         
         # Direct match first